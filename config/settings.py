@@ -6,10 +6,53 @@ variables used throughout the application.
 """
 
 import os
+from functools import lru_cache
 from typing import Dict, Any
 from dataclasses import dataclass
 from pathlib import Path
 
+from utils.json_utils import load_json_file
+
+
+@lru_cache(maxsize=8)
+def _load_json(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON config file; cached per path and modification time."""
+    return load_json_file(path)
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a YAML config file; cached per path and modification time.
+    
+    libyaml's C loader is used when PyYAML was built with it. The parsed
+    result is deliberately not cached on disk: loading a pickle kept beside
+    the config would run code for anyone able to write that directory.
+    """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+def load_config_file(path: Path) -> Dict[str, Any]:
+    """
+    Load a JSON or YAML configuration file, parsing it at most once per change.
+    
+    Worker processes forked after the first load inherit the parsed result.
+    Callers must treat the returned dictionary as read-only.
+    
+    Args:
+        path: Path to a .json, .yml or .yaml file
+        
+    Returns:
+        Parsed configuration
+    """
+    mtime_ns = path.stat().st_mtime_ns
+    if path.suffix in ('.yml', '.yaml'):
+        return _load_yaml(str(path), mtime_ns)
+    return _load_json(str(path), mtime_ns)
+
 
 @dataclass
 class DatabaseConfig:
@@ -34,6 +77,10 @@ class AnalysisConfig:
     default_parallel_threads: int = 10
     default_time_range_days: int = 30
     max_file_size_mb: int = 100
+    metadata_workers: int = 8
+    # Use the file mtime as the end time of rotated .gz logs instead of
+    # decompressing them to read the last line
+    gz_end_time_from_mtime: bool = False
     supported_log_types: Dict[str, str] = None
     supported_process_types: list = None
     
@@ -63,9 +110,7 @@ class Settings:
         """Load database configuration from JSON file."""
         db_config_path = self.base_dir / "db_config.json"
         if db_config_path.exists():
-            import json
-            with open(db_config_path) as f:
-                db_data = json.load(f)
+            db_data = load_config_file(db_config_path)
             self.database = DatabaseConfig(**db_data)
         else:
             # Default database configuration
@@ -82,9 +127,7 @@ class Settings:
         """Load server configuration from JSON file."""
         server_config_path = self.base_dir / "server_config.json"
         if server_config_path.exists():
-            import json
-            with open(server_config_path) as f:
-                server_data = json.load(f)
+            server_data = load_config_file(server_config_path)
             self.server = ServerConfig(**server_data)
         else:
             # Default server configuration
@@ -96,6 +139,10 @@ class Settings:
         """Path to the log configuration YAML file."""
         return self.base_dir / "log_conf.yml"
     
+    def load_log_config(self) -> Dict[str, Any]:
+        """Load the parsed log pattern configuration (cached)."""
+        return load_config_file(self.log_conf_path)
+    
     @property
     def uploads_dir(self) -> Path:
         """Path to the uploads directory."""
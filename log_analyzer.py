@@ -16,9 +16,11 @@ This version follows best practices including:
 
 import argparse
 import sys
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Optional, List
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Optional, List, Tuple
 import logging
 
 from colorama import Fore, Style, init
@@ -31,29 +33,83 @@ from utils.exceptions import (
     ValidationError,
     AnalysisError
 )
-from models.log_metadata import AnalysisConfig
+from models.log_metadata import AnalysisConfig, AnalysisReport
 from services.analysis_service import AnalysisService
-from services.database_service import DatabaseService
-from services.parquet_service import ParquetAnalysisService
+from services.file_processor import support_bundle_name
+from services.pattern_matcher import compile_custom_patterns
+from utils.time_utils import CURRENT_YEAR
+
+if TYPE_CHECKING:
+    # Imported on first use instead: psycopg2, pandas and duckdb make up most
+    # of the start-up time and are not needed for --help or argument errors
+    from services.database_service import DatabaseService
+    from services.parquet_service import ParquetAnalysisService
 
 
 # Initialize colorama for cross-platform colored output
 init()
 
+# Format of the --from_time/--to_time arguments
+CLI_TIME_FORMAT = "%m%d %H:%M"
+
+
+def parse_cli_time(value: str) -> datetime:
+    """
+    Parse a "MMDD HH:MM" argument into a datetime in the current year.
+    
+    The arguments carry no year; like glog timestamps, they are taken to be
+    in the current year.
+    
+    Raises:
+        ValueError: If the value is not in MMDD HH:MM format
+    """
+    return datetime.strptime(value, CLI_TIME_FORMAT).replace(year=CURRENT_YEAR)
+
+
+def _int_range(low: int, high: int) -> Callable[[str], int]:
+    """Build an argparse type accepting integers in [low, high]."""
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+        if not low <= number <= high:
+            raise argparse.ArgumentTypeError(f"must be between {low} and {high}")
+        return number
+    return parse
+
+
+# ANSI sequences for the help output, looked up once
+_GREEN = str(Fore.GREEN)
+_YELLOW = str(Fore.YELLOW)
+_CYAN = str(Fore.CYAN)
+_MAGENTA = str(Fore.MAGENTA)
+_LIGHTCYAN = str(Fore.LIGHTCYAN_EX)
+_RESET = str(Style.RESET_ALL)
+
 
 class ColoredHelpFormatter(argparse.RawTextHelpFormatter):
-    """Custom argument parser formatter with colored output."""
+    """Custom argument parser formatter with colored output (terminals only)."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # No escape sequences when the help is piped or redirected
+        self._colored = sys.stdout.isatty()
     
     def _get_help_string(self, action):
-        return Fore.GREEN + super()._get_help_string(action) + Style.RESET_ALL
+        if not self._colored:
+            return super()._get_help_string(action)
+        return f"{_GREEN}{super()._get_help_string(action)}{_RESET}"
 
     def _format_usage(self, usage, actions, groups, prefix):
-        return Fore.YELLOW + super()._format_usage(usage, actions, groups, prefix) + Style.RESET_ALL
+        if not self._colored:
+            return super()._format_usage(usage, actions, groups, prefix)
+        return f"{_YELLOW}{super()._format_usage(usage, actions, groups, prefix)}{_RESET}"
     
     def _format_action_invocation(self, action):
         if not action.option_strings:
             metavar, = self._metavar_formatter(action, action.dest)(1)
-            return Fore.CYAN + metavar + Style.RESET_ALL
+            invocation = metavar
         else:
             parts = []
             if action.nargs == 0:
@@ -63,17 +119,25 @@ class ColoredHelpFormatter(argparse.RawTextHelpFormatter):
                 args_string = self._format_args(action, default)
                 parts.extend(action.option_strings)
                 parts[-1] += ' ' + args_string
-            return Fore.CYAN + ', '.join(parts) + Style.RESET_ALL
+            invocation = ', '.join(parts)
+        if not self._colored:
+            return invocation
+        return f"{_CYAN}{invocation}{_RESET}"
     
     def _format_action(self, action):
-        parts = super()._format_action(action)
-        return Fore.CYAN + parts + Style.RESET_ALL
+        if not self._colored:
+            return super()._format_action(action)
+        return f"{_CYAN}{super()._format_action(action)}{_RESET}"
     
     def _format_text(self, text):
-        return Fore.MAGENTA + super()._format_text(text) + Style.RESET_ALL
+        if not self._colored:
+            return super()._format_text(text)
+        return f"{_MAGENTA}{super()._format_text(text)}{_RESET}"
     
     def _format_args(self, action, default_metavar):
-        return Fore.LIGHTCYAN_EX + super()._format_args(action, default_metavar) + Style.RESET_ALL
+        if not self._colored:
+            return super()._format_args(action, default_metavar)
+        return f"{_LIGHTCYAN}{super()._format_args(action, default_metavar)}{_RESET}"
 
 
 class LogAnalyzerApp:
@@ -81,15 +145,38 @@ class LogAnalyzerApp:
     
     def __init__(self):
         self.logger = get_logger("log_analyzer")
-        self.analysis_service = AnalysisService()
-        self.database_service = DatabaseService()
-        self.parquet_service = ParquetAnalysisService()
+        # Reports are linked from several log messages; built once
+        self._report_url_base = f"http://{settings.server.host}:{settings.server.port}/reports/"
+    
+    # Services are created on first use, so --help and invalid arguments
+    # exit without setting them up
+    @cached_property
+    def analysis_service(self) -> AnalysisService:
+        """Support bundle analysis service."""
+        return AnalysisService()
+    
+    @cached_property
+    def database_service(self) -> "DatabaseService":
+        """Report database service."""
+        from services.database_service import DatabaseService
+        return DatabaseService()
+    
+    @cached_property
+    def parquet_service(self) -> "ParquetAnalysisService":
+        """Parquet analysis service."""
+        from services.parquet_service import ParquetAnalysisService
+        return ParquetAnalysisService()
     
     def setup_argument_parser(self) -> argparse.ArgumentParser:
         """Set up command line argument parser."""
+        default_threads = settings.analysis_config.default_parallel_threads
+        default_metadata_workers = settings.analysis_config.metadata_workers
+        # Colors are only worth it for an explicit help request; usage in
+        # error messages is formatted plain
+        help_requested = any(arg in ("-h", "--help") for arg in sys.argv[1:])
         parser = argparse.ArgumentParser(
             description="Log Analyzer for YugabyteDB logs",
-            formatter_class=ColoredHelpFormatter
+            formatter_class=ColoredHelpFormatter if help_requested else argparse.RawTextHelpFormatter
         )
         # Input options
         input_group = parser.add_mutually_exclusive_group(required=True)
@@ -122,28 +209,42 @@ class LogAnalyzerApp:
             "-p", "--parallel",
             metavar="N",
             dest='num_threads',
-            default=settings.analysis_config.default_parallel_threads,
-            type=int,
-            help=f"Run in parallel mode with N threads (default: {settings.analysis_config.default_parallel_threads})"
+            default=default_threads,
+            type=_int_range(1, 20),
+            help=f"Run in parallel mode with N threads (default: {default_threads})"
         )
         parser.add_argument(
             "--skip_tar",
             action="store_true",
             help="Skip tar file extraction (assumes already extracted)"
         )
+        parser.add_argument(
+            "--metadata_workers",
+            metavar="N",
+            default=default_metadata_workers,
+            type=_int_range(1, 64),
+            help=f"Read log file time ranges with N threads (default: {default_metadata_workers})"
+        )
+        parser.add_argument(
+            "--gz_end_time_from_mtime",
+            action="store_true",
+            default=settings.analysis_config.gz_end_time_from_mtime,
+            help="Use the file modification time as the end time of .gz logs\n"
+                 "instead of decompressing them to read the last line"
+        )
         
         # Time range options
         parser.add_argument(
             "-t", "--from_time",
             metavar="MMDD HH:MM",
             dest="start_time",
-            help="Specify start time in quotes (e.g., '1231 10:30')"
+            help="Specify start time in quotes (e.g., '1231 10:30'); default: no lower bound"
         )
         parser.add_argument(
             "-T", "--to_time",
             metavar="MMDD HH:MM",
             dest="end_time",
-            help="Specify end time in quotes (e.g., '1231 23:59')"
+            help="Specify end time in quotes (e.g., '1231 23:59'); default: now"
         )
         
         # Analysis mode options
@@ -165,36 +266,27 @@ class LogAnalyzerApp:
     
     def validate_arguments(self, args: argparse.Namespace) -> None:
         """Validate command line arguments."""
-        # Validate time format
+        # Validate time format; parsed once here and kept on args
+        args.start_dt = None
         if args.start_time:
             try:
-                datetime.strptime(args.start_time, "%m%d %H:%M")
+                args.start_dt = parse_cli_time(args.start_time)
             except ValueError:
                 raise ValidationError("Incorrect start time format, should be MMDD HH:MM")
         
+        args.end_dt = None
         if args.end_time:
             try:
-                datetime.strptime(args.end_time, "%m%d %H:%M")
+                args.end_dt = parse_cli_time(args.end_time)
             except ValueError:
                 raise ValidationError("Incorrect end time format, should be MMDD HH:MM")
         
-        # Validate parallel threads
-        if args.num_threads < 1 or args.num_threads > 20:
-            raise ValidationError("Parallel threads must be between 1 and 20")
-        
-        # Validate parquet options
+        # Validate parquet options; time, node and type filters are pushed
+        # down into the Parquet scans
         if args.parquet_files:
             unsupported_opts = []
-            if args.types:
-                unsupported_opts.append("--types")
-            if args.nodes:
-                unsupported_opts.append("--nodes")
             if args.skip_tar:
                 unsupported_opts.append("--skip_tar")
-            if args.start_time:
-                unsupported_opts.append("--from_time")
-            if args.end_time:
-                unsupported_opts.append("--to_time")
             
             if unsupported_opts:
                 raise ValidationError(
@@ -202,42 +294,45 @@ class LogAnalyzerApp:
                 )
     
     def parse_time_range(self, args: argparse.Namespace) -> tuple[datetime, datetime]:
-        """Parse and validate time range from arguments."""
-        # Calculate default time range
-        default_start_time = datetime.now() - timedelta(days=settings.analysis_config.default_time_range_days)
-        default_start_time = default_start_time.strftime("%m%d %H:%M")
-
-        # Parse start time
-        if args.start_time:
-            start_time = datetime.strptime(args.start_time, "%m%d %H:%M")
-        else:
-            start_time = datetime.strptime(default_start_time, "%m%d %H:%M")
-        
-        # Parse end time
-        if args.end_time:
-            end_time = datetime.strptime(args.end_time, "%m%d %H:%M")
-        else:
-            end_time = datetime.now()
+        """Get the time range from validated arguments, defaulting missing bounds."""
+        now = datetime.now()
+        start_time = getattr(args, "start_dt", None)
+        if start_time is None:
+            # No lower bound: bundles are often analyzed long after their
+            # logs were written, and every log line must be kept
+            start_time = datetime.min
+        
+        end_time = getattr(args, "end_dt", None)
+        if end_time is None:
+            end_time = now
         
         return start_time, end_time
     
-    def create_analysis_config(self, args: argparse.Namespace) -> AnalysisConfig:
-        """Create analysis configuration from arguments."""
-        start_time, end_time = self.parse_time_range(args)
-        
-        # Parse filters
+    def parse_filters(self, args: argparse.Namespace) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+        """Parse the node and log type filters from arguments."""
         node_filter = None
         if args.nodes:
             node_filter = [n.strip().lower() for n in args.nodes.split(',') if n.strip()]
         
         log_type_filter = None
         if args.types:
+            supported_log_types = settings.analysis_config.supported_log_types
             requested_types = [t.strip().lower() for t in args.types.split(',') if t.strip()]
-            log_type_filter = [settings.analysis_config.supported_log_types.get(t, t) for t in requested_types]
+            log_type_filter = [supported_log_types.get(t, t) for t in requested_types]
+        
+        return node_filter, log_type_filter
+    
+    def create_analysis_config(self, args: argparse.Namespace) -> AnalysisConfig:
+        """Create analysis configuration from arguments."""
+        start_time, end_time = self.parse_time_range(args)
+        node_filter, log_type_filter = self.parse_filters(args)
         
         histogram_mode = None
+        compiled_histogram_patterns = None
         if args.histogram_mode:
             histogram_mode = [p.strip() for p in args.histogram_mode.split(',') if p.strip()]
+            # Compiled here once instead of by every analysis worker
+            compiled_histogram_patterns = compile_custom_patterns(histogram_mode)
         
         return AnalysisConfig(
             start_time=start_time,
@@ -245,27 +340,37 @@ class LogAnalyzerApp:
             parallel_threads=args.num_threads,
             histogram_mode=histogram_mode,
             node_filter=node_filter,
-            log_type_filter=log_type_filter
+            log_type_filter=log_type_filter,
+            compiled_histogram_patterns=compiled_histogram_patterns,
+            metadata_workers=args.metadata_workers,
+            gz_end_time_from_mtime=args.gz_end_time_from_mtime
         )
     
-    def analyze_support_bundle(self, args: argparse.Namespace) -> None:
-        """Analyze a support bundle."""
+    def analyze_support_bundle(self, args: argparse.Namespace) -> Optional[str]:
+        """
+        Analyze a support bundle and store the report.
+        
+        Returns:
+            ID of the stored (or previously stored) report, or None if the
+            report could not be stored in the database
+        """
         bundle_path = Path(args.support_bundle)
         if not bundle_path.exists():
             raise ValidationError(f"Support bundle not found: {bundle_path}")
         
-        # Check if already analyzed
-        bundle_name = bundle_path.stem.replace('.tar', '').replace('.tgz', '')
-        existing_report_id = self.database_service.check_report_exists(bundle_name)
+        # Check if already analyzed; --force re-analyzes regardless, so the
+        # database lookup is skipped
+        bundle_name = support_bundle_name(bundle_path)
+        existing_report_id = None if args.force else self.database_service.check_report_exists(bundle_name)
         
-        if existing_report_id and not args.force:
+        if existing_report_id:
             self.logger.warning(f"📊 Analysis already completed for support bundle '{bundle_name}'.")
             self.logger.warning(f"🔁 Use --force option to re-trigger the analysis forcefully.")
             self.logger.warning(f"🔗 Use the link below to view the report:")
-            report_url = f"http://{settings.server.host}:{settings.server.port}/reports/{existing_report_id}"
+            report_url = f"{self._report_url_base}{existing_report_id}"
             self.logger.warning(report_url)
             self.logger.info(f"🔁 Use --force option to re-trigger the analysis forcefully.")            
-            return
+            return existing_report_id
         
         # Create analysis configuration
         analysis_config = self.create_analysis_config(args)
@@ -290,15 +395,14 @@ class LogAnalyzerApp:
             report_id = self.database_service.store_report(report)
             
             # Generate report URL
-            report_url = f"http://{settings.server.host}:{settings.server.port}/reports/{report_id}"
+            report_url = f"{self._report_url_base}{report_id}"
             
             # Create success marker file
             marker_file = bundle_path.parent / f"{bundle_name}.analyzed"
             try:
-                with open(marker_file, "w") as f:
-                    f.write(report_url + "\n")
+                marker_file.write_text(f"{report_url}\n")
                 self.logger.info("✅ Success marker file created.")
-            except Exception as e:
+            except OSError as e:
                 self.logger.warning(f"Failed to create marker file: {e}")
                 
         except Exception as e:
@@ -306,14 +410,14 @@ class LogAnalyzerApp:
             # Still show success for analysis, but warn about database issue
             self.logger.info("✅ Analysis completed successfully!")
             self.logger.warning("⚠️  Report could not be stored in database. Check database connection.")
-            return
+            return None
         
         self.logger.info("✅ Analysis completed successfully!")
         self.logger.info(f"👉 Report available at: {report_url}")
+        return report_id
     
     def analyze_parquet_files(self, args: argparse.Namespace) -> None:
         """Analyze Parquet files."""
-        import time
         parquet_dir = Path(args.parquet_files)
         if not parquet_dir.exists():
             raise ValidationError(f"Parquet directory not found: {parquet_dir}")
@@ -330,23 +434,36 @@ class LogAnalyzerApp:
         bundle_name = self.parquet_service.get_bundle_name_from_parquet(parquet_dir)
         self.logger.info(f"🚀 Starting Parquet analysis for: {bundle_name}")
         
-        existing_report_id = self.database_service.check_report_exists(bundle_name)
-        if existing_report_id and not args.force:
+        existing_report_id = None if args.force else self.database_service.check_report_exists(bundle_name)
+        if existing_report_id:
             # If report already exists and --force is not used, skip analysis
             self.logger.warning(f"📊 Analysis already completed for Parquet bundle '{bundle_name}'.")
             self.logger.warning(f"🔗 Use the link below to view the report:")
-            report_url = f"http://{settings.server.host}:{settings.server.port}/reports/{existing_report_id}"
+            report_url = f"{self._report_url_base}{existing_report_id}"
             self.logger.warning(report_url)
             self.logger.info(f"🔁 Use --force option to re-trigger the analysis forcefully.")
             return
         
         self.logger.info(f"📊 Using {len(patterns)} patterns for analysis")
         
+        # Only the bounds given are applied
+        start_time = args.start_dt
+        end_time = args.end_dt
+        node_filter, log_type_filter = self.parse_filters(args)
+        if log_type_filter:
+            # Parquet rows carry process types ("tserver"), not log
+            # directory names ("yb-tserver")
+            log_type_filter = [log_type.removeprefix("yb-") for log_type in log_type_filter]
+        
         start_analysis = time.time()
         result = self.parquet_service.analyze_parquet_files(
             parquet_dir=parquet_dir,
             patterns=patterns,
-            num_threads=args.num_threads
+            num_threads=args.num_threads,
+            start_time=start_time,
+            end_time=end_time,
+            node_filter=node_filter,
+            log_type_filter=log_type_filter
         )
         analysis_time = time.time() - start_analysis
         
@@ -363,51 +480,8 @@ class LogAnalyzerApp:
         # Store in database and generate URL
         start_db = time.time()
         try:
-            # Create an AnalysisReport from the Parquet results
-            from models.log_metadata import AnalysisReport, NodeAnalysisResult, LogMessageStats
-            
             # Convert Parquet results to AnalysisReport format
-            converted_nodes = {}
-            
-            for node_name, node_data in result.get("nodes", {}).items():
-                converted_nodes[node_name] = {}
-                for log_type, log_type_data in node_data.items():
-                    node_result = NodeAnalysisResult(
-                        node_name=node_name,
-                        log_type=log_type,
-                        log_messages={}
-                    )
-                    for pattern_name, message_data in log_type_data.get("logMessages", {}).items():
-                        # Robustly handle None and invalid ISO strings
-                        def parse_dt(val):
-                            if val is None:
-                                return datetime.min
-                            try:
-                                # Accept both ISO and DuckDB string
-                                if isinstance(val, str):
-                                    # If already ISO, parse
-                                    if "T" in val:
-                                        # Remove trailing Z if present
-                                        val = val.rstrip("Z")
-                                        # If no timezone, add +00:00
-                                        if "+" not in val and "-" not in val:
-                                            val += "+00:00"
-                                        return datetime.fromisoformat(val)
-                                    else:
-                                        # Try DuckDB default format
-                                        return datetime.strptime(val[:19], "%Y-%m-%d %H:%M:%S")
-                                return val
-                            except Exception:
-                                return datetime.min
-                        log_stats = LogMessageStats(
-                            pattern_name=pattern_name,
-                            start_time=parse_dt(message_data.get("StartTime")),
-                            end_time=parse_dt(message_data.get("EndTime")),
-                            count=message_data["count"],
-                            histogram=message_data["histogram"]
-                        )
-                        node_result.log_messages[pattern_name] = log_stats
-                    converted_nodes[node_name][log_type] = node_result
+            converted_nodes = self.parquet_service.build_report_nodes(result.get("nodes", {}))
             
             # Use actual bundle name from Parquet data
             bundle_name = result.get("universeName", parquet_dir.name)
@@ -437,7 +511,7 @@ class LogAnalyzerApp:
             report_id = self.database_service.store_report(report)
             
             # Generate report URL
-            report_url = f"http://{settings.server.host}:{settings.server.port}/reports/{report_id}"
+            report_url = f"{self._report_url_base}{report_id}"
             
             db_time = time.time() - start_db
             
@@ -475,39 +549,8 @@ class LogAnalyzerApp:
             
             # Run analysis based on input type
             if args.support_bundle:
-                # Analyze support bundle and get report_id
-                bundle_path = Path(args.support_bundle)
-                bundle_name = bundle_path.stem.replace('.tar', '').replace('.tgz', '')
-                # Check if already analyzed
-                existing_report_id = self.database_service.check_report_exists(bundle_name)
-                force = getattr(args, 'force', False)
-                if existing_report_id and not force:
-                    report_id = existing_report_id
-                    self.logger.warning(f"📊 Analysis already completed for support bundle '{bundle_name}'.")
-                    self.logger.warning(f"🔁 Use --force option to re-trigger the analysis forcefully")
-                    self.logger.warning(f"🔗 Use the link below to view the report:")
-                    report_url = f"http://{settings.server.host}:{settings.server.port}/reports/{existing_report_id}"
-                    self.logger.warning(report_url)
-                else:
-                    analysis_config = self.create_analysis_config(args)
-                    report = self.analysis_service.analyze_support_bundle(
-                        bundle_path=bundle_path,
-                        analysis_config=analysis_config,
-                        skip_extraction=args.skip_tar
-                    )
-                    if args.output_file:
-                        output_path = Path(args.output_file)
-                        self.analysis_service.save_report(report, output_path)
-                    try:
-                        report_id = self.database_service.store_report(report)
-                        self.logger.info("✅ Analysis completed successfully!")
-                        self.logger.info(f"👉 Report available at: http://{settings.server.host}:{settings.server.port}/reports/{report_id}")
-                        self.logger.info(f"📊 Results saved to: {output_path}")
-                    except Exception as e:
-                        self.logger.error(f"👉 Failed to insert report into PostgreSQL: {e}")
-                        self.logger.info("✅ Analysis completed successfully!")
-                        self.logger.warning("⚠️  Report could not be stored in database. Check database connection.")
-                        return 1
+                if self.analyze_support_bundle(args) is None:
+                    return 1
             elif args.parquet_files:
                 self.analyze_parquet_files(args)
             return 0
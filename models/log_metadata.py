@@ -5,6 +5,7 @@ This module defines the data structures used throughout the application
 for representing log files, metadata, and analysis results.
 """
 
+import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -141,6 +142,13 @@ class AnalysisConfig:
     histogram_mode: Optional[List[str]] = None
     node_filter: Optional[List[str]] = None
     log_type_filter: Optional[List[str]] = None
+    # histogram_mode patterns compiled once when the configuration is built
+    compiled_histogram_patterns: Optional[Dict[str, re.Pattern]] = None
+    # Threads reading log file time ranges for the bundle metadata
+    metadata_workers: int = 8
+    # Use the file mtime as the end time of rotated .gz logs instead of
+    # decompressing them to read the last line
+    gz_end_time_from_mtime: bool = False
     
     def validate(self) -> None:
         """Validate the analysis configuration."""
@@ -151,4 +159,7 @@ class AnalysisConfig:
             raise ValueError("Parallel threads must be at least 1")
         
         if self.parallel_threads > 20:
-            raise ValueError("Parallel threads cannot exceed 20") 
\ No newline at end of file
+            raise ValueError("Parallel threads cannot exceed 20")
+        
+        if self.metadata_workers < 1:
+            raise ValueError("Metadata workers must be at least 1") 
\ No newline at end of file
@@ -5,15 +5,18 @@ This module provides the main service for orchestrating log analysis,
 including parallel processing, result aggregation, and report generation.
 """
 
-import json
+import multiprocessing
 import os
+import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool
 import logging
 import threading
 import time
+from itertools import repeat
 
 from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TaskProgressColumn
 
@@ -23,17 +26,246 @@ from models.log_metadata import (
     AnalysisReport, 
     SupportBundleInfo, 
     AnalysisConfig,
+    LogFileMetadata,
     NodeAnalysisResult,
     LogMessageStats
 )
-from services.file_processor import FileProcessor
+from services.file_processor import FileProcessor, support_bundle_name
 from services.pattern_matcher import PatternMatcher
 from utils.exceptions import AnalysisError, ValidationError
+from utils.json_utils import dump_json_file, dumps, load_json_file
+from utils.time_utils import CURRENT_YEAR
 from config.settings import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Per-process PatternMatcher and analysis configuration, set once by the pool
+# initializer so that patterns are compiled once per worker and the
+# configuration (with its compiled histogram patterns) is not pickled per task
+_worker_pattern_matcher: Optional[PatternMatcher] = None
+_worker_analysis_config: Optional[AnalysisConfig] = None
+
+
+def _init_analysis_worker(
+    analysis_config: Optional[AnalysisConfig] = None,
+    pattern_matcher: Optional[PatternMatcher] = None
+) -> None:
+    """
+    Pool initializer: set up the worker's PatternMatcher and keep the configuration.
+    
+    A matcher passed in by a forking parent is used as is, with the
+    patterns and combined regexes it already compiled.
+    """
+    global _worker_pattern_matcher, _worker_analysis_config
+    _worker_pattern_matcher = pattern_matcher if pattern_matcher is not None else PatternMatcher()
+    _worker_analysis_config = analysis_config
+
+
+def _analyze_files_worker(task: Tuple) -> Optional[NodeAnalysisResult]:
+    """
+    Pool entry point: analyze one task's files with the worker's matcher.
+    
+    Tasks are (task_id, node_name, log_type, sub_type, files); the analysis
+    configuration comes from the pool initializer.
+    """
+    global _worker_pattern_matcher
+    if _worker_pattern_matcher is None:
+        _worker_pattern_matcher = PatternMatcher()
+    return analyze_log_files(_worker_pattern_matcher, (*task, _worker_analysis_config))
+
+
+# Per-file metadata of an extracted bundle is cached so re-runs only scan
+# files that changed. Bump the version whenever metadata extraction changes,
+# so caches written by older code are discarded rather than reused.
+METADATA_CACHE_VERSION = 1
+
+# Minimum interval between redraws of progress bars refreshed by their loop
+PROGRESS_REFRESH_SECONDS = 0.1
+
+MetadataCache = Dict[str, Tuple[Tuple[int, int], Optional[LogFileMetadata]]]
+
+
+def _metadata_cache_path(extracted_dir: Path, bundle_name: str) -> Path:
+    """
+    Return the metadata cache file of an extracted bundle.
+    
+    The cache sits beside the extraction marker rather than inside the
+    extracted tree, whose contents come from the bundle itself.
+    """
+    return extracted_dir.parent / f".{bundle_name}.metadata.json"
+
+
+def _metadata_to_json(metadata: Optional[LogFileMetadata]) -> Optional[Dict[str, Any]]:
+    """Convert file metadata to a JSON-serializable cache entry."""
+    if metadata is None:
+        return None
+    return {
+        "node_name": metadata.node_name,
+        "log_type": metadata.log_type,
+        "sub_type": metadata.sub_type,
+        "start_time": metadata.start_time.isoformat(),
+        "end_time": metadata.end_time.isoformat(),
+    }
+
+
+def _metadata_from_json(file_path: str, data: Optional[Dict[str, Any]]) -> Optional[LogFileMetadata]:
+    """Rebuild file metadata from a cache entry."""
+    if data is None:
+        return None
+    return LogFileMetadata(
+        file_path=Path(file_path),
+        node_name=str(data["node_name"]),
+        log_type=str(data["log_type"]),
+        sub_type=str(data["sub_type"]),
+        start_time=datetime.fromisoformat(data["start_time"]),
+        end_time=datetime.fromisoformat(data["end_time"])
+    )
+
+
+def _load_metadata_cache(cache_path: Path, gz_end_time_from_mtime: bool) -> MetadataCache:
+    """
+    Load cached per-file metadata.
+    
+    Entries map a file path to ((size, mtime_ns), metadata). The cache is
+    discarded when it was written by another cache version, with another
+    gz_end_time_from_mtime setting, which changes the extracted end times,
+    or in another year, which glog timestamps are parsed into; malformed
+    entries are skipped.
+    
+    Args:
+        cache_path: Path to the cache file
+        gz_end_time_from_mtime: Setting of the current run
+        
+    Returns:
+        Cached entries, empty if there is no usable cache
+    """
+    try:
+        data = load_json_file(cache_path)
+    except (OSError, ValueError):
+        return {}
+    if (not isinstance(data, dict)
+            or data.get("version") != METADATA_CACHE_VERSION
+            or data.get("gz_end_time_from_mtime") != gz_end_time_from_mtime
+            or data.get("current_year") != CURRENT_YEAR
+            or not isinstance(data.get("files"), dict)):
+        return {}
+    
+    entries = {}
+    for file_path, entry in data["files"].items():
+        try:
+            key = (int(entry["size"]), int(entry["mtime_ns"]))
+            entries[file_path] = (key, _metadata_from_json(file_path, entry["metadata"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return entries
+
+
+def _save_metadata_cache(cache_path: Path, entries: MetadataCache, gz_end_time_from_mtime: bool) -> None:
+    """Write the per-file metadata cache atomically; failures are ignored."""
+    data = {
+        "version": METADATA_CACHE_VERSION,
+        "gz_end_time_from_mtime": gz_end_time_from_mtime,
+        "current_year": CURRENT_YEAR,
+        "files": {
+            file_path: {"size": size, "mtime_ns": mtime_ns, "metadata": _metadata_to_json(metadata)}
+            for file_path, ((size, mtime_ns), metadata) in entries.items()
+        },
+    }
+    try:
+        temp_path = f"{cache_path}.{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(dumps(data))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write metadata cache {cache_path}: {e}")
+
+
+def _file_size(file_path: str) -> int:
+    """Return the size of a file, or 0 if it cannot be read."""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+def merge_message_stats(
+    target: Dict[str, LogMessageStats],
+    source: Dict[str, LogMessageStats]
+) -> None:
+    """
+    Merge per-pattern statistics from source into target in place.
+    
+    Args:
+        target: Statistics to merge into
+        source: Statistics to merge from
+    """
+    for pattern_name, stats in source.items():
+        existing_stats = target.get(pattern_name)
+        if existing_stats is None:
+            target[pattern_name] = stats
+            continue
+        existing_stats.count += stats.count
+        existing_stats.start_time = min(existing_stats.start_time, stats.start_time)
+        existing_stats.end_time = max(existing_stats.end_time, stats.end_time)
+        histogram = existing_stats.histogram
+        for time_key, count in stats.histogram.items():
+            histogram[time_key] = histogram.get(time_key, 0) + count
+
+
+def _patterns_for_task(
+    pattern_matcher: PatternMatcher,
+    log_type: str,
+    analysis_config: AnalysisConfig
+) -> Dict[str, re.Pattern]:
+    """Return the patterns to match in the files of a log type."""
+    if analysis_config.compiled_histogram_patterns:
+        return analysis_config.compiled_histogram_patterns
+    if analysis_config.histogram_mode:
+        return pattern_matcher.get_custom_patterns(analysis_config.histogram_mode)
+    return pattern_matcher.get_patterns_for_log_type(log_type)
+
+
+def analyze_log_files(pattern_matcher: PatternMatcher, task: Tuple) -> Optional[NodeAnalysisResult]:
+    """
+    Analyze the files of a single task and merge their statistics.
+    
+    Args:
+        pattern_matcher: PatternMatcher used to compile and match patterns
+        task: Tuple of (task_id, node_name, log_type, sub_type, file_paths, analysis_config)
+        
+    Returns:
+        NodeAnalysisResult for the task, or None if there is nothing to analyze
+    """
+    try:
+        task_id, node_name, log_type, sub_type, file_paths, analysis_config = task
+        
+        patterns = _patterns_for_task(pattern_matcher, log_type, analysis_config)
+        if not patterns:
+            logger.warning(f"No patterns found for log type: {log_type}")
+            return None
+        
+        # Analyze each file
+        all_message_stats: Dict[str, LogMessageStats] = {}
+        for file_path in file_paths:
+            file_stats = pattern_matcher.analyze_log_file(
+                file_path,
+                patterns,
+                analysis_config.start_time,
+                analysis_config.end_time
+            )
+            merge_message_stats(all_message_stats, file_stats)
+        
+        return NodeAnalysisResult(
+            node_name=node_name,
+            log_type=log_type,
+            log_messages=all_message_stats
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in analysis worker: {e}")
+        return None
+
 
 class AnalysisService:
     """Main service for log analysis orchestration."""
@@ -70,10 +302,10 @@ class AnalysisService:
             if not skip_extraction:
                 extracted_dir = self.file_processor.extract_support_bundle(bundle_path)
             else:
-                extracted_dir = bundle_path.parent / bundle_path.stem.replace('.tar', '').replace('.tgz', '')
+                extracted_dir = bundle_path.parent / support_bundle_name(bundle_path)
             
             # Build support bundle info
-            support_bundle_info = self._build_support_bundle_info(extracted_dir, bundle_path.name)
+            support_bundle_info = self._build_support_bundle_info(extracted_dir, bundle_path.name, analysis_config)
             
             # Filter nodes and log types if specified
             self._apply_filters(support_bundle_info, analysis_config)
@@ -92,7 +324,8 @@ class AnalysisService:
     def _build_support_bundle_info(
         self, 
         extracted_dir: Path, 
-        bundle_name: str
+        bundle_name: str,
+        analysis_config: AnalysisConfig
     ) -> SupportBundleInfo:
         """Build support bundle information from extracted directory."""
         # Find log files
@@ -103,7 +336,6 @@ class AnalysisService:
         metadata_for_json = {}
 
         # Extract metadata for each log file with progress bar
-        from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TaskProgressColumn
         total = len(log_files)
         width = len(str(total))
         columns = [
@@ -113,12 +345,53 @@ class AnalysisService:
             TextColumn(f"[{{task.completed:0{width}d}}/{{task.total:0{width}d}}]"),
             TimeElapsedColumn()
         ]
-        with Progress(*columns) as progress:
+        # Files unchanged since the last run (same size and mtime) reuse
+        # their cached metadata; only the others are read
+        cache_path = _metadata_cache_path(extracted_dir, bundle_name)
+        gz_end_time_from_mtime = analysis_config.gz_end_time_from_mtime
+        cache = _load_metadata_cache(cache_path, gz_end_time_from_mtime)
+        file_keys = []
+        for log_file in log_files:
+            try:
+                stat = log_file.stat()
+                file_keys.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                # Read (and fail) like any uncached file; never cached
+                file_keys.append(None)
+        stale_files = [
+            log_file for log_file, key in zip(log_files, file_keys)
+            if key is None or cache.get(str(log_file), (None, None))[0] != key
+        ]
+        if len(stale_files) < total:
+            logger.info(f"Reusing cached metadata for {total - len(stale_files)} unchanged log files")
+        
+        # Metadata reads are I/O and zlib bound, both of which release the GIL,
+        # so a thread pool overlaps them without pickling anything
+        workers = max(1, min(analysis_config.metadata_workers, len(stale_files) or 1))
+        new_cache = {}
+        # The bar is redrawn from this loop, at most every
+        # PROGRESS_REFRESH_SECONDS, instead of by rich's refresh thread, which
+        # would wake up to take the GIL from the metadata workers
+        with Progress(*columns, auto_refresh=False) as progress, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
             task = progress.add_task("metadata", total=total)
-            for log_file in log_files:
-                metadata = self.file_processor.get_file_metadata(log_file)
+            next_refresh = 0.0
+            read_metadata = executor.map(
+                self.file_processor.get_file_metadata, stale_files, repeat(gz_end_time_from_mtime)
+            )
+            for log_file, key in zip(log_files, file_keys):
+                cached_key, metadata = cache.get(str(log_file), (None, None))
+                if key is None or cached_key != key:
+                    # Results arrive in stale_files order, i.e. log_files order
+                    metadata = next(read_metadata)
+                if key is not None:
+                    new_cache[str(log_file)] = (key, metadata)
+                progress.advance(task)
+                now = time.monotonic()
+                if now >= next_refresh:
+                    progress.refresh()
+                    next_refresh = now + PROGRESS_REFRESH_SECONDS
                 if not metadata:
-                    progress.update(task, advance=1)
                     continue
                 
                 # Organize by node -> log_type -> sub_type -> file_path -> metadata
@@ -142,15 +415,16 @@ class AnalysisService:
                 if sub_type not in metadata_for_json[node_name][log_type]:
                     metadata_for_json[node_name][log_type][sub_type] = {}
                 metadata_for_json[node_name][log_type][sub_type][str(log_file)] = {
-                    "logStartsAt": metadata.start_time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "logEndsAt": metadata.end_time.strftime("%Y-%m-%d %H:%M:%S")
+                    "logStartsAt": metadata.start_time.isoformat(sep=" ", timespec="seconds"),
+                    "logEndsAt": metadata.end_time.isoformat(sep=" ", timespec="seconds")
                 }
-                progress.update(task, advance=1)
+        
+        if new_cache != cache:
+            _save_metadata_cache(cache_path, new_cache, gz_end_time_from_mtime)
         
         # Dump metadata to JSON for debugging (original format)
         metadata_json_path = extracted_dir / "log_file_metadata.json"
-        with open(metadata_json_path, 'w') as f:
-            json.dump(metadata_for_json, f, indent=2)
+        dump_json_file(metadata_json_path, metadata_for_json, indent=True)
         
         logger.info(f"Metadata written to {metadata_json_path}")
         
@@ -167,25 +441,25 @@ class AnalysisService:
         analysis_config: AnalysisConfig
     ) -> None:
         """Apply node and log type filters to support bundle info."""
-        # Filter nodes
-        if analysis_config.node_filter:
-            filtered_metadata = {}
-            for node_name in analysis_config.node_filter:
-                if node_name in support_bundle_info.log_files_metadata:
-                    filtered_metadata[node_name] = support_bundle_info.log_files_metadata[node_name]
-            support_bundle_info.log_files_metadata = filtered_metadata
+        # Each filter becomes a set once, so every node and log type is
+        # checked with a single lookup in one pass over the metadata
+        requested_nodes = set(analysis_config.node_filter or ())
+        requested_log_types = set(analysis_config.log_type_filter or ())
+        if not requested_nodes and not requested_log_types:
+            return
         
-        # Filter log types
-        if analysis_config.log_type_filter:
-            for node_name in support_bundle_info.log_files_metadata:
-                node_data = support_bundle_info.log_files_metadata[node_name]
-                filtered_node_data = {}
-                
-                for log_type in analysis_config.log_type_filter:
-                    if log_type in node_data:
-                        filtered_node_data[log_type] = node_data[log_type]
-                
-                support_bundle_info.log_files_metadata[node_name] = filtered_node_data
+        support_bundle_info.log_files_metadata = {
+            node_name: (
+                {
+                    log_type: log_type_data
+                    for log_type, log_type_data in node_data.items()
+                    if log_type in requested_log_types
+                }
+                if requested_log_types else node_data
+            )
+            for node_name, node_data in support_bundle_info.log_files_metadata.items()
+            if not requested_nodes or node_name in requested_nodes
+        }
     
     def _analyze_logs(
         self, 
@@ -205,20 +479,38 @@ class AnalysisService:
                         analysis_config.start_time, 
                         analysis_config.end_time
                     )
-                    if filtered_files:
+                    # One task per file so a node with many large files
+                    # is spread across all workers; results are merged below
+                    for file_path in filtered_files:
                         tasks.append((
                             task_id,
                             node_name,
                             log_type,
                             sub_type,
-                            filtered_files,
-                            analysis_config
+                            [file_path]
                         ))
                         task_id += 1
+        # Largest files first, so a dominant file does not start last and
+        # leave the other workers idle while it finishes
+        tasks.sort(key=lambda task: _file_size(task[4][0]), reverse=True)
         # Process tasks in parallel with rich progress bar
         if tasks:
-            results = []
-            with Pool(processes=analysis_config.parallel_threads) as pool:
+            aggregated_results = {}
+            # Forked workers inherit the parent's matcher, so the combined
+            # regexes are compiled once here rather than once per worker;
+            # other start methods would have to pickle it and build their own
+            shared_matcher = None
+            if multiprocessing.get_start_method() == "fork":
+                shared_matcher = self.pattern_matcher
+                for log_type in {task[2] for task in tasks}:
+                    patterns = _patterns_for_task(shared_matcher, log_type, analysis_config)
+                    if patterns:
+                        shared_matcher.get_combined_pattern(patterns)
+            with Pool(
+                processes=analysis_config.parallel_threads,
+                initializer=_init_analysis_worker,
+                initargs=(analysis_config, shared_matcher)
+            ) as pool:
                 total = len(tasks)
                 width = len(str(total))
                 columns = [
@@ -230,33 +522,18 @@ class AnalysisService:
                 ]
                 with Progress(*columns) as progress:
                     task_id_progress = progress.add_task("parse", total=total)
-                    for result in pool.imap_unordered(self._analyze_node_logs_worker, tasks):
-                        results.append(result)
+                    # Results are merged as they arrive, overlapping the
+                    # merge with the workers still running
+                    for result in pool.imap_unordered(_analyze_files_worker, tasks):
                         progress.update(task_id_progress, advance=1)
-            # Aggregate results
-            aggregated_results = {}
-            for result in results:
-                if result:
-                    node_name = result.node_name
-                    log_type = result.log_type
-                    if node_name not in aggregated_results:
-                        aggregated_results[node_name] = {}
-                    if log_type not in aggregated_results[node_name]:
-                        aggregated_results[node_name][log_type] = result
-                    else:
-                        # Merge log messages
-                        for pattern_name, stats in result.log_messages.items():
-                            if pattern_name in aggregated_results[node_name][log_type].log_messages:
-                                existing_stats = aggregated_results[node_name][log_type].log_messages[pattern_name]
-                                existing_stats.count += stats.count
-                                existing_stats.start_time = min(existing_stats.start_time, stats.start_time)
-                                existing_stats.end_time = max(existing_stats.end_time, stats.end_time)
-                                for time_key, count in stats.histogram.items():
-                                    existing_stats.histogram[time_key] = (
-                                        existing_stats.histogram.get(time_key, 0) + count
-                                    )
-                            else:
-                                aggregated_results[node_name][log_type].log_messages[pattern_name] = stats
+                        if not result:
+                            continue
+                        node_results = aggregated_results.setdefault(result.node_name, {})
+                        existing = node_results.get(result.log_type)
+                        if existing is None:
+                            node_results[result.log_type] = result
+                        else:
+                            merge_message_stats(existing.log_messages, result.log_messages)
             return aggregated_results
         return {}
     
@@ -267,69 +544,12 @@ class AnalysisService:
         end_time: datetime
     ) -> List[str]:
         """Filter files by time range."""
-        filtered_files = []
-        
-        for file_path, metadata in files_metadata.items():
-            file_start = metadata.start_time
-            file_end = metadata.end_time
-            
-            # Check if file overlaps with time range
-            if (file_start <= end_time and file_end >= start_time):
-                filtered_files.append(file_path)
-        
-        return filtered_files
-    
-    def _analyze_node_logs_worker(self, task: Tuple) -> Optional[NodeAnalysisResult]:
-        """Worker function for parallel log analysis."""
-        try:
-            task_id, node_name, log_type, sub_type, file_paths, analysis_config = task
-            
-            # Get patterns for log type
-            if analysis_config.histogram_mode:
-                patterns = self.pattern_matcher.get_custom_patterns(analysis_config.histogram_mode)
-            else:
-                patterns = self.pattern_matcher.get_patterns_for_log_type(log_type)
-            
-            if not patterns:
-                logger.warning(f"No patterns found for log type: {log_type}")
-                return None
-            
-            # Analyze each file
-            all_message_stats = {}
-            
-            for file_path in file_paths:
-                file_stats = self.pattern_matcher.analyze_log_file(
-                    file_path,
-                    patterns,
-                    analysis_config.start_time,
-                    analysis_config.end_time
-                )
-                
-                # Merge statistics
-                for pattern_name, stats in file_stats.items():
-                    if pattern_name in all_message_stats:
-                        existing_stats = all_message_stats[pattern_name]
-                        existing_stats.count += stats.count
-                        existing_stats.start_time = min(existing_stats.start_time, stats.start_time)
-                        existing_stats.end_time = max(existing_stats.end_time, stats.end_time)
-                        
-                        # Merge histogram
-                        for time_key, count in stats.histogram.items():
-                            existing_stats.histogram[time_key] = (
-                                existing_stats.histogram.get(time_key, 0) + count
-                            )
-                    else:
-                        all_message_stats[pattern_name] = stats
-            
-            return NodeAnalysisResult(
-                node_name=node_name,
-                log_type=log_type,
-                log_messages=all_message_stats
-            )
-            
-        except Exception as e:
-            logger.error(f"Error in analysis worker: {e}")
-            return None
+        # Keep files whose [start, end] overlaps the analysis window
+        return [
+            file_path
+            for file_path, metadata in files_metadata.items()
+            if metadata.start_time <= end_time and metadata.end_time >= start_time
+        ]
     
     def _generate_report(
         self,
@@ -390,8 +610,7 @@ class AnalysisService:
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w') as f:
-                json.dump(report.to_dict(), f, indent=2)
+            dump_json_file(output_path, report.to_dict(), indent=True)
             
             logger.info(f"Report saved to: {output_path}")
             
@@ -401,8 +620,7 @@ class AnalysisService:
     def load_report(self, report_path: Path) -> AnalysisReport:
         """Load analysis report from file."""
         try:
-            with open(report_path, 'r') as f:
-                report_data = json.load(f)
+            report_data = load_json_file(report_path)
             
             # Convert back to AnalysisReport object
             # This is a simplified conversion - in a real implementation,
@@ -6,21 +6,44 @@ report storage, retrieval, and metadata management.
 """
 
 import json
+import threading
 import uuid
-from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 import logging
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extras import Json, register_default_jsonb
 from psycopg2.extensions import connection, cursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 from utils.exceptions import DatabaseError
+from utils.json_utils import dumps, loads
 from models.log_metadata import AnalysisReport
 from config.settings import settings
 
 
 logger = logging.getLogger(__name__)
 
+# Reports are large JSONB documents; encode and decode them with the
+# faster json_utils helpers instead of psycopg2's stdlib json default
+register_default_jsonb(globally=True, loads=loads)
+
+
+def _dumps_text(value: Any) -> str:
+    """Serialize a value to JSON text for a Json adapter."""
+    return dumps(value).decode("utf-8")
+
+
+# Connections are shared by every DatabaseService in the process. Up to
+# POOL_MIN_CONNECTIONS stay open between operations, and up to
+# POOL_MAX_CONNECTIONS are pooled while in use
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 8
+
+_pools: Dict[Tuple[Any, ...], ThreadedConnectionPool] = {}
+_pools_lock = threading.Lock()
+
 
 class DatabaseService:
     """Service for database operations."""
@@ -28,18 +51,81 @@ class DatabaseService:
     def __init__(self):
         self.db_config = settings.database
     
-    def get_connection(self) -> connection:
-        """Get a database connection."""
+    def _connection_kwargs(self) -> Dict[str, Any]:
+        """Return the psycopg2.connect arguments for the configured database."""
+        return {
+            'dbname': self.db_config.dbname,
+            'user': self.db_config.user,
+            'password': self.db_config.password,
+            'host': self.db_config.host,
+            'port': self.db_config.port
+        }
+    
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Return the process-wide connection pool for the configured database."""
+        kwargs = self._connection_kwargs()
+        key = tuple(kwargs.values())
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ThreadedConnectionPool(
+                    POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, **kwargs
+                )
+            return pool
+    
+    def _borrow_pooled(self, pool: ThreadedConnectionPool) -> connection:
+        """
+        Take a connection from the pool, replacing it if it no longer works.
+        
+        A pooled connection may have been dropped by a database restart or an
+        idle timeout since its last use; a trivial query finds out before the
+        caller gets it. A failed connection is closed and a new one taken.
+        """
+        conn = pool.getconn()
+        if not conn.closed:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                return conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                logger.info(f"Discarding broken pooled database connection: {e}")
+        pool.putconn(conn, close=True)
+        return pool.getconn()
+    
+    @contextmanager
+    def get_connection(self) -> Iterator[connection]:
+        """
+        Borrow a database connection from the pool.
+        
+        The transaction is committed on success and rolled back on error, as
+        with psycopg2's ``with conn:`` block, and the connection is then
+        returned to the pool. Pooled connections are checked before use, see
+        _borrow_pooled. When every pooled connection is in use, a dedicated
+        one is opened and closed afterwards.
+        
+        Raises:
+            DatabaseError: If no connection can be established
+        """
         try:
-            return psycopg2.connect(
-                dbname=self.db_config.dbname,
-                user=self.db_config.user,
-                password=self.db_config.password,
-                host=self.db_config.host,
-                port=self.db_config.port
-            )
+            pool = self._get_pool()
+            try:
+                conn = self._borrow_pooled(pool)
+                pooled = True
+            except PoolError:
+                conn = psycopg2.connect(**self._connection_kwargs())
+                pooled = False
         except Exception as e:
             raise DatabaseError(f"Failed to connect to database: {e}")
+        
+        try:
+            with conn:
+                yield conn
+        finally:
+            if pooled:
+                # Broken connections are closed by the pool rather than reused
+                pool.putconn(conn)
+            else:
+                conn.close()
     
     def store_report(self, report: AnalysisReport) -> str:
         """
@@ -71,7 +157,7 @@ class DatabaseService:
                         (id, support_bundle_name, json_report, created_at)
                         VALUES (%s, %s, %s, NOW())
                         """,
-                        (report_id, report.support_bundle_name, Json(report.to_dict()))
+                        (report_id, report.support_bundle_name, Json(report.to_dict(), dumps=_dumps_text))
                     )
                     conn.commit()
                     logger.info("INSERT statement executed and committed successfully")
@@ -329,32 +415,21 @@ class DatabaseService:
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cur:
-                    # Get support bundle name
-                    cur.execute(
-                        "SELECT support_bundle_name FROM public.log_analyzer_reports WHERE id::text = %s",
-                        (report_id,)
-                    )
-                    row = cur.fetchone()
-                    if not row:
-                        return {}
-                    
-                    support_bundle_name = row[0]
-                    
-                    # Get GFlags
+                    # Resolve the support bundle and fetch its GFlags in one round trip
                     cur.execute(
                         """
-                        SELECT server_type, gflag, value
-                        FROM public.support_bundle_gflags
-                        WHERE support_bundle = %s
+                        SELECT g.server_type, g.gflag, g.value
+                        FROM public.log_analyzer_reports r
+                        JOIN public.support_bundle_gflags g
+                          ON g.support_bundle = r.support_bundle_name
+                        WHERE r.id::text = %s
                         """,
-                        (support_bundle_name,)
+                        (report_id,)
                     )
                     
                     gflags = {}
                     for server_type, gflag, value in cur.fetchall():
-                        if server_type not in gflags:
-                            gflags[server_type] = {}
-                        gflags[server_type][gflag] = value
+                        gflags.setdefault(server_type, {})[gflag] = value
                     
                     return gflags
                     
@@ -5,24 +5,279 @@ This module provides services for extracting, reading, and processing
 log files from support bundles with proper error handling.
 """
 
-import gzip
+import io
+import mmap
+import re
+import shutil
+import subprocess
 import tarfile
+import tempfile
 import os
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterator, Optional, List, Dict, Any
+from typing import Iterable, Iterator, Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import logging
 import json
 
+try:
+    # ISA-L accelerated inflate, a drop-in replacement for the gzip module
+    from isal import igzip as gzip
+except ImportError:  # pragma: no cover - optional dependency
+    import gzip
+
 from utils.exceptions import FileProcessingError, SupportBundleError
 from models.log_metadata import LogFileMetadata, SupportBundleInfo
 from config.settings import settings
-from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TaskProgressColumn
+from utils.time_utils import LogTimeParser, find_first_timestamp, parse_log_timestamp
+from rich.progress import (
+    Progress, BarColumn, DownloadColumn, TaskID, TextColumn, TimeElapsedColumn, TaskProgressColumn
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+# Compressed files at least this large are decompressed by an external
+# pigz/gzip process, which is several times faster than in-process inflate
+EXTERNAL_GUNZIP_MIN_BYTES = 8 * 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def _external_gunzip_command() -> Optional[List[str]]:
+    """Return the command used to stream-decompress gzip files, if available."""
+    for tool in ("pigz", "gzip"):
+        executable = shutil.which(tool)
+        if executable:
+            return [executable, "-dc"]
+    return None
+
+
+# Nested archives are extracted concurrently, reading with large buffers
+NESTED_EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+TAR_READ_BUFFER_BYTES = 1024 * 1024
+# Member data is copied out of archives in chunks of this size (tarfile's
+# default is 16 KiB)
+TAR_COPY_BUFFER_BYTES = 2 * 1024 * 1024
+
+# Node name patterns, tried in order against the full path
+NODE_NAME_PATTERNS = [
+    re.compile(r"/(yb-[^/]*n\d+)/"),
+    re.compile(r"/(yb-(master|tserver)-\d+_[^/]+)/"),
+    re.compile(r"/([^/]+-node-\d+)/"),
+]
+
+# File name keywords, highest priority first
+LOG_TYPE_PRIORITY = ("postgres", "controller", "tserver", "master", "application")
+LOG_TYPES_BY_KEYWORD = {
+    "postgres": "postgres",
+    "controller": "yb-controller",
+    "tserver": "yb-tserver",
+    "master": "yb-master",
+    "application": "YBA",
+}
+SUB_TYPE_PRIORITY = ("INFO", "WARN", "ERROR", "FATAL")
+# Log types whose files carry no severity in the name default to INFO
+DEFAULT_INFO_KEYWORDS = frozenset(("postgres", "application"))
+# One case-insensitive scan finds both kinds of keyword
+FILE_NAME_KEYWORD_RE = re.compile(
+    f"(?P<log>{'|'.join(LOG_TYPE_PRIORITY)})|(?P<sub>{'|'.join(SUB_TYPE_PRIORITY)})",
+    re.IGNORECASE
+)
+
+
+def classify_log_file_name(file_name: str) -> Tuple[str, str]:
+    """
+    Derive the log type and sub type of a log file from its name.
+    
+    When several keywords of a kind appear in the name, the one with the
+    highest priority wins.
+    
+    Args:
+        file_name: Base name of the log file
+        
+    Returns:
+        Tuple of (log_type, sub_type); "unknown" where nothing matches
+    """
+    log_keywords = set()
+    sub_keywords = set()
+    for match in FILE_NAME_KEYWORD_RE.finditer(file_name):
+        if match.lastgroup == "log":
+            log_keywords.add(match.group().lower())
+        else:
+            sub_keywords.add(match.group().upper())
+    
+    log_type = next(
+        (LOG_TYPES_BY_KEYWORD[keyword] for keyword in LOG_TYPE_PRIORITY if keyword in log_keywords),
+        "unknown"
+    )
+    sub_type = next(
+        (keyword for keyword in SUB_TYPE_PRIORITY if keyword in sub_keywords),
+        "INFO" if log_keywords & DEFAULT_INFO_KEYWORDS else "unknown"
+    )
+    return log_type, sub_type
+
+# Buffer size for the byte streams under the text readers; larger than the
+# 8 KiB default to cut read calls into the decompressor and the kernel
+READ_BUFFER_SIZE = 128 * 1024
+
+# Head of a log file searched for its first timestamp in one read
+HEAD_BUFFER_BYTES = 16 * 1024
+
+# Compressed head of a .gz log inflated in one shot when only its first
+# timestamp is needed (128 KiB of gzip is roughly 1 MiB of log text)
+GZ_HEAD_COMPRESSED_BYTES = 128 * 1024
+GZ_HEAD_MAX_BYTES = 1024 * 1024
+
+# Text is read in chunks that start small (cheap head reads for metadata)
+# and grow up to READ_CHUNK_MAX_CHARS for full scans
+READ_CHUNK_MIN_CHARS = 64 * 1024
+READ_CHUNK_MAX_CHARS = 1024 * 1024
+
+# The end of a .gz log is found by inflating it in large binary reads and
+# keeping only its last lines
+GZ_TAIL_READ_BYTES = 1024 * 1024
+
+
+def _iter_chunked_lines(f: io.TextIOBase) -> Iterator[str]:
+    """Yield the lines of a text stream without newlines, splitting bulk reads."""
+    chunk_size = READ_CHUNK_MIN_CHARS
+    tail = ''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()
+        yield from lines
+        if chunk_size < READ_CHUNK_MAX_CHARS:
+            chunk_size *= 2
+    if tail:
+        yield tail
+
+
+def _read_gz_head(file_path: Path) -> str:
+    """
+    Inflate the head of a gzip file with a single read and decompress call.
+    
+    Returns only whole lines, or an empty string if the head cannot be
+    decompressed.
+    """
+    with open(file_path, 'rb') as raw:
+        compressed_head = raw.read(GZ_HEAD_COMPRESSED_BYTES)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        head = decompressor.decompress(compressed_head, GZ_HEAD_MAX_BYTES)
+    except zlib.error:
+        return ''
+    if not decompressor.eof:
+        head = head[:head.rfind(b'\n') + 1]
+    return head.decode('utf-8', errors='ignore')
+
+
+def _read_tail_lines(f: io.BufferedIOBase, count: int, block_size: int = 8192) -> List[str]:
+    """Read the last lines of a seekable binary file, backwards in blocks."""
+    position = f.seek(0, os.SEEK_END)
+    data = b''
+    # One extra newline is needed to know the first kept line is whole
+    while position > 0 and data.count(b'\n') <= count:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        data = f.read(read_size) + data
+    
+    lines = [line.rstrip('\r') for line in data.decode('utf-8', errors='ignore').split('\n')]
+    if lines and not lines[-1]:
+        lines.pop()
+    if position > 0:
+        # The first line may be cut off at the block boundary
+        lines = lines[1:]
+    return lines[-count:]
+
+
+def _read_gz_tail_lines(file_path: Path, count: int) -> List[str]:
+    """
+    Read the last lines of a gzip file.
+    
+    The stream cannot seek, so it is inflated to the end, but in bulk reads
+    that are neither decoded nor split into lines. After each read, only the
+    bytes from the start of the last count lines are kept, however long
+    those lines are; only they are decoded at the end.
+    """
+    data = b''
+    with gzip.open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(GZ_TAIL_READ_BYTES)
+            if not chunk:
+                break
+            data += chunk
+            # The (count + 1)-th newline from the end closes the line before
+            # the kept ones; searching backwards only touches the tail
+            cut = len(data)
+            for _ in range(count + 1):
+                cut = data.rfind(b'\n', 0, cut)
+                if cut == -1:
+                    break
+            if cut != -1:
+                data = data[cut + 1:]
+    
+    lines = [line.rstrip('\r') for line in data.decode('utf-8', errors='ignore').split('\n')]
+    if lines and not lines[-1]:
+        lines.pop()
+    return lines[-count:]
+
+
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield directory entries for the files under root.
+    
+    Uses os.scandir directly so file names and types come from the cached
+    directory entries rather than a stat() per path. Symlinked directories
+    are not followed.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_files(entry.path)
+                elif entry.is_file():
+                    yield entry
+    except OSError as e:
+        logger.debug(f"Cannot scan directory {root}: {e}")
+
+
+def _move_tree(source: Path, destination: Path) -> None:
+    """
+    Move the contents of a directory into another, merging subdirectories.
+    
+    Entries already present in the destination are replaced, as when a tar
+    member is extracted over an existing file. Moves are renames, so both
+    directories must be on the same filesystem.
+    """
+    destination.mkdir(parents=True, exist_ok=True)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            target = destination / entry.name
+            if entry.is_dir(follow_symlinks=False) and target.is_dir() and not target.is_symlink():
+                _move_tree(Path(entry.path), target)
+                continue
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            os.replace(entry.path, target)
+
+
+def support_bundle_name(bundle_path: Path) -> str:
+    """
+    Return the name of a support bundle, which is also its extraction directory.
+    
+    Path.stem drops the last suffix, so "x.tgz" gives "x" and "x.tar.gz"
+    gives "x.tar", which leaves only ".tar" to strip.
+    """
+    return bundle_path.stem.removesuffix('.tar')
+
+
 class FileProcessor:
     """Service for processing log files and support bundles."""
     
@@ -47,63 +302,203 @@ class FileProcessor:
             raise SupportBundleError(f"Support bundle not found: {bundle_path}")
         if not self._is_support_bundle(bundle_path):
             raise SupportBundleError(f"Invalid support bundle format: {bundle_path}")
+        extracted_dir = bundle_path.parent / support_bundle_name(bundle_path)
+        marker = self._extraction_marker(bundle_path)
         try:
-            extracted_dir = bundle_path.parent / bundle_path.stem.replace('.tar', '').replace('.tgz', '')
-            # Extract the main archive with progress bar
-            with tarfile.open(bundle_path, "r:gz") as tar:
-                members = tar.getmembers()
-                total = len(members)
-                width = len(str(total))
+            if (extracted_dir.is_dir() and marker.exists()
+                    and marker.stat().st_mtime >= bundle_path.stat().st_mtime):
+                # Re-runs on the same bundle reuse the previous extraction
+                logger.info(f"Support bundle already extracted to: {extracted_dir}")
+                return extracted_dir
+            
+            # Stream the main archive in a single pass: members are written
+            # as they are decompressed, and nested archives are handed to the
+            # extraction pool as soon as they are complete on disk
+            failed = 0
+            with open(bundle_path, 'rb', buffering=TAR_READ_BUFFER_BYTES) as raw, \
+                    tarfile.open(fileobj=raw, mode="r|gz", copybufsize=TAR_COPY_BUFFER_BYTES) as tar:
                 columns = [
                     TextColumn("[cyan]Extracting support bundle..."),
                     BarColumn(),
                     TaskProgressColumn(),
-                    TextColumn(f"[{{task.completed:0{width}d}}/{{task.total:0{width}d}}]"),
+                    DownloadColumn(),
                     TimeElapsedColumn()
                 ]
                 with Progress(*columns) as progress:
-                    task = progress.add_task("extract", total=total)
-                    for idx, member in enumerate(members, 1):
-                        tar.extract(member, bundle_path.parent)
-                        progress.update(task, advance=1)
-            # Extract nested archives (no progress bar for simplicity)
-            self._extract_nested_archives(extracted_dir)
+                    # Progress is measured in compressed bytes consumed, since
+                    # the member count is unknown until the stream ends
+                    task = progress.add_task("extract", total=bundle_path.stat().st_size)
+                    failed = self._extract_nested_archives(
+                        extracted_dir,
+                        self._stream_bundle_members(tar, bundle_path.parent, raw, progress, task)
+                    )
+            if failed:
+                # No marker: the next run extracts the bundle again
+                logger.warning(
+                    f"Extracted support bundle to {extracted_dir}, "
+                    f"but {failed} nested archive(s) could not be extracted"
+                )
+                return extracted_dir
+            marker.touch()
             logger.info(f"Successfully extracted support bundle to: {extracted_dir}")
             return extracted_dir
             
         except Exception as e:
             raise SupportBundleError(f"Failed to extract support bundle: {e}")
     
+    def _stream_bundle_members(
+        self,
+        tar: tarfile.TarFile,
+        destination: Path,
+        raw: io.BufferedReader,
+        progress: Progress,
+        task: TaskID
+    ) -> Iterator[Path]:
+        """
+        Extract the members of a streamed archive in order.
+        
+        Args:
+            tar: Archive opened in streaming mode
+            destination: Directory to extract into
+            raw: Compressed stream under the archive, for progress
+            progress: Progress bar to advance
+            task: Progress task of the extraction
+            
+        Yields:
+            Nested archives, once they have been written
+        """
+        for member in tar:
+            tar.extract(member, destination)
+            progress.update(task, completed=raw.tell())
+            if member.isfile() and self._is_support_bundle(Path(member.name)):
+                yield destination / member.name
+    
+    def _extraction_marker(self, bundle_path: Path) -> Path:
+        """Return the hidden file marking a completed extraction of a bundle."""
+        return bundle_path.parent / f".{bundle_path.name}.extracted"
+    
     def _is_support_bundle(self, file_path: Path) -> bool:
         """Check if a file is a valid support bundle."""
         return any(file_path.name.endswith(ext) for ext in self.archive_extensions)
     
-    def _extract_nested_archives(self, directory: Path) -> None:
-        """Extract all nested tar archives in a directory."""
-        extracted_files = set()
+    def _extract_nested_archives(self, directory: Path, archives: Optional[Iterable[Path]] = None) -> int:
+        """
+        Extract all nested tar archives in a directory.
         
-        while True:
-            archive_files = self._find_archive_files(directory)
-            if not archive_files or all(f in extracted_files for f in archive_files):
-                break
+        Unless the initial archives are given, the directory is walked once;
+        archives that appear inside extracted archives are picked up from the
+        tar member list instead of re-walking the whole tree. Given archives
+        may be a lazy iterable (e.g. a streaming extraction), in which case
+        each one is submitted as soon as it is yielded.
+        
+        Archives are extracted concurrently on a thread pool, since
+        decompression and file writes release the GIL, but each into its own
+        staging directory outside the extracted tree. Only this thread moves
+        the staged files into place, one archive at a time and after the
+        given archives are exhausted, so archives sharing directories (or
+        members) never write to them concurrently, nor alongside a running
+        streaming extraction.
+        
+        Args:
+            directory: Directory containing the archives
+            archives: Archives to start from, if already known
+            
+        Returns:
+            Number of archives that could not be extracted
+        """
+        if archives is None:
+            # The initial walk finishes before extraction starts, so it never
+            # sees half-written archives from a running extraction
+            archives = list(self.iter_archive_files(directory))
+        
+        staging_root = directory.parent
+        failed = 0
+        seen = set()
+        with ThreadPoolExecutor(max_workers=NESTED_EXTRACT_WORKERS) as executor:
+            futures = {}
             
-            for archive_file in archive_files:
-                if archive_file not in extracted_files:
+            def submit(archive: Path) -> None:
+                if archive not in seen:
+                    seen.add(archive)
+                    futures[executor.submit(self._extract_archive, archive, staging_root)] = archive
+            
+            for archive in archives:
+                submit(archive)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    archive = futures.pop(future)
+                    staged = future.result()
+                    if staged is None:
+                        failed += 1
+                        continue
+                    staging_dir, nested_archives = staged
                     try:
-                        with tarfile.open(archive_file, "r:gz") as tar:
-                            tar.extractall(archive_file.parent)
-                        extracted_files.add(archive_file)
-                        logger.debug(f"Extracted nested archive: {archive_file}")
-                    except Exception as e:
-                        logger.warning(f"Failed to extract nested archive {archive_file}: {e}")
+                        _move_tree(staging_dir, archive.parent)
+                    except OSError as e:
+                        logger.warning(f"Failed to move extracted files of {archive}: {e}")
+                        failed += 1
+                        continue
+                    finally:
+                        shutil.rmtree(staging_dir, ignore_errors=True)
+                    for nested in nested_archives:
+                        submit(nested)
+                pending.update(futures.keys() - pending)
+        return failed
+    
+    def _extract_archive(self, archive_file: Path, staging_root: Path) -> Optional[Tuple[Path, List[Path]]]:
+        """
+        Extract one nested archive into a new staging directory.
+        
+        Args:
+            archive_file: Path to a .tar.gz/.tgz archive
+            staging_root: Directory to create the staging directory in
+            
+        Returns:
+            Tuple of (staging directory, archives among the members at their
+            final paths next to archive_file), or None on failure
+        """
+        try:
+            staging_dir = Path(tempfile.mkdtemp(prefix=f".{archive_file.name}.", dir=staging_root))
+        except OSError as e:
+            logger.warning(f"Failed to extract nested archive {archive_file}: {e}")
+            return None
+        try:
+            with open(archive_file, 'rb', buffering=TAR_READ_BUFFER_BYTES) as raw, \
+                    tarfile.open(fileobj=raw, mode="r:gz", copybufsize=TAR_COPY_BUFFER_BYTES) as tar:
+                members = tar.getmembers()
+                tar.extractall(staging_dir, members=members)
+            logger.debug(f"Extracted nested archive: {archive_file}")
+        except Exception as e:
+            logger.warning(f"Failed to extract nested archive {archive_file}: {e}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return None
+        
+        return staging_dir, [
+            archive_file.parent / member.name
+            for member in members
+            if member.isfile() and self._is_support_bundle(Path(member.name))
+        ]
+    
+    def iter_archive_files(self, directory: Path) -> Iterator[Path]:
+        """
+        Lazily yield the archive files under a directory.
+        
+        Args:
+            directory: Directory to search
+            
+        Yields:
+            Paths of .tar.gz/.tgz files, as they are found
+        """
+        archive_extensions = tuple(self.archive_extensions)
+        for entry in _iter_files(str(directory)):
+            if entry.name.endswith(archive_extensions):
+                yield Path(entry.path)
     
     def _find_archive_files(self, directory: Path) -> List[Path]:
         """Find all archive files in a directory."""
-        archive_files = []
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and self._is_support_bundle(file_path):
-                archive_files.append(file_path)
-        return archive_files
+        return list(self.iter_archive_files(directory))
     
     def find_log_files(self, directory: Path) -> List[Path]:
         """
@@ -117,25 +512,19 @@ class FileProcessor:
         """
         log_files = []
         
-        for file_path in directory.rglob("*"):
-            if (file_path.is_file() and 
-                any(pattern in file_path.name.lower() for pattern in self.supported_logs) and
-                self._is_log_file(file_path)):
-                log_files.append(file_path)
+        # Resolve the root once; scandir entry paths are joined onto it, so
+        # no per-file abspath (and getcwd) is needed
+        for entry in _iter_files(os.path.abspath(directory)):
+            if entry.name.startswith('.'):
+                # Hidden files, e.g. "._" AppleDouble copies in tarballs built on macOS
+                continue
+            name = entry.name.lower()
+            if 'log' in name and any(pattern in name for pattern in self.supported_logs):
+                log_files.append(Path(entry.path))
         
         logger.info(f"Found {len(log_files)} log files in {directory}")
         return log_files
     
-    def _is_log_file(self, file_path: Path) -> bool:
-        """Check if a file is a log file based on name patterns."""
-        filename = file_path.name.lower()
-        
-        # Check for log file patterns
-        log_patterns = [
-            'log'
-        ]
-        return any(pattern in filename for pattern in log_patterns)
-    
     def read_log_file(self, file_path: Path) -> Iterator[str]:
         """
         Read a log file line by line, handling compression.
@@ -151,30 +540,88 @@ class FileProcessor:
         """
         try:
             if file_path.suffix == '.gz':
-                with gzip.open(file_path, 'rt', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        yield line.rstrip('\n')
+                command = _external_gunzip_command()
+                if command and file_path.stat().st_size >= EXTERNAL_GUNZIP_MIN_BYTES:
+                    yield from self._read_gzip_external(file_path, command)
+                    return
+                raw = io.BufferedReader(gzip.open(file_path, 'rb'), buffer_size=READ_BUFFER_SIZE)
             else:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        yield line.rstrip('\n')
+                raw = open(file_path, 'rb', buffering=READ_BUFFER_SIZE)
+            with io.TextIOWrapper(raw, encoding='utf-8', errors='ignore') as f:
+                yield from _iter_chunked_lines(f)
+        except Exception as e:
+            raise FileProcessingError(f"Failed to read log file {file_path}: {e}")
+    
+    def _read_gzip_external(self, file_path: Path, command: List[str]) -> Iterator[str]:
+        """
+        Read a gzip file line by line through an external decompressor.
+        
+        The process is terminated if the caller stops iterating early, and a
+        non-zero exit status after a full read is reported as an error.
+        """
+        proc = subprocess.Popen(
+            command + [str(file_path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1 << 20
+        )
+        completed = False
+        try:
+            with io.TextIOWrapper(proc.stdout, encoding='utf-8', errors='ignore') as f:
+                yield from _iter_chunked_lines(f)
+            completed = True
+        finally:
+            if not completed:
+                proc.kill()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise FileProcessingError(f"{command[0]} exited with status {returncode}")
+    
+    def read_matching_lines(self, file_path: Path, line_finder: Any) -> Iterator[str]:
+        """
+        Read only the lines of a plain log file that contain a candidate match.
+        
+        The file is memory-mapped and scanned by a line finder (see
+        services.line_finder), so lines without a match are never split out
+        or decoded. Callers must still verify each yielded line with their
+        str patterns: the scan only narrows down which lines can match.
+        
+        Args:
+            file_path: Path to an uncompressed log file
+            line_finder: Line finder locating candidate lines
+            
+        Yields:
+            Candidate lines from the log file
+            
+        Raises:
+            FileProcessingError: If file cannot be read
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    for line_start, line_end in line_finder.iter_line_spans(buf):
+                        yield buf[line_start:line_end].decode('utf-8', errors='ignore').rstrip('\r')
         except Exception as e:
             raise FileProcessingError(f"Failed to read log file {file_path}: {e}")
     
-    def get_file_metadata(self, file_path: Path) -> Optional[LogFileMetadata]:
+    def get_file_metadata(
+        self, file_path: Path, gz_end_time_from_mtime: bool = False
+    ) -> Optional[LogFileMetadata]:
         """
         Extract metadata from a log file.
         
         Args:
             file_path: Path to the log file
+            gz_end_time_from_mtime: Use the mtime of .gz logs as their end time
             
         Returns:
             LogFileMetadata object or None if metadata cannot be extracted
         """
         try:
             # Read first and last few lines to get time range
-            start_time = self._extract_start_time(file_path)
-            end_time = self._extract_end_time(file_path)
+            start_time, end_time = self._extract_time_range(file_path, gz_end_time_from_mtime)
             
             if not start_time or not end_time:
                 logger.warning(f"Could not extract time range from {file_path}")
@@ -182,8 +629,7 @@ class FileProcessor:
             
             # Extract other metadata
             node_name = self._extract_node_name(file_path)
-            log_type = self._extract_log_type(file_path)
-            sub_type = self._extract_sub_type(file_path)
+            log_type, sub_type = classify_log_file_name(file_path.name)
             
             return LogFileMetadata(
                 file_path=file_path,
@@ -198,68 +644,110 @@ class FileProcessor:
             logger.error(f"Failed to extract metadata from {file_path}: {e}")
             return None
     
-    def _extract_start_time(self, file_path: Path) -> Optional[datetime]:
-        """Extract the start time from a log file."""
+    def _extract_time_range(
+        self, file_path: Path, gz_end_time_from_mtime: bool = False
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Extract the start and end time of a log file.
+        
+        Plain files are opened once: the head is read forwards and the tail
+        backwards from the same handle.
+        """
+        if file_path.suffix == '.gz':
+            return self._extract_gz_time_range(file_path, gz_end_time_from_mtime)
+        
+        start_time = None
+        end_time = None
+        time_parser = LogTimeParser()
         try:
-            for line in self.read_log_file(file_path):
-                timestamp = self._parse_timestamp(line)
-                if timestamp:
-                    return timestamp
+            with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+                head = f.read(HEAD_BUFFER_BYTES)
+                if len(head) == HEAD_BUFFER_BYTES:
+                    # Only search whole lines; the rest is read line by line
+                    line_end = head.rfind(b'\n') + 1
+                    head = head[:line_end]
+                    f.seek(line_end)
+                start_time = find_first_timestamp(head.decode('utf-8', errors='ignore'))
+                if start_time is None:
+                    for raw_line in f:
+                        start_time = time_parser.parse(raw_line.decode('utf-8', errors='ignore').rstrip('\r\n'))
+                        if start_time:
+                            break
+                if start_time:
+                    for line in reversed(_read_tail_lines(f, 20)):  # Check last 20 lines
+                        end_time = time_parser.parse(line)
+                        if end_time:
+                            break
         except Exception as e:
-            logger.debug(f"Failed to extract start time from {file_path}: {e}")
+            logger.debug(f"Failed to extract time range from {file_path}: {e}")
         
-        return None
+        return start_time, end_time
     
-    def _extract_end_time(self, file_path: Path) -> Optional[datetime]:
-        """Extract the end time from a log file."""
+    def _extract_gz_time_range(
+        self, file_path: Path, gz_end_time_from_mtime: bool = False
+    ) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Extract the start and end time of a gzipped log file.
+        
+        Gzip streams cannot seek: the first timestamp is read from the head
+        of the line stream and the last one from the tail of a bulk inflate,
+        or from the file mtime if gz_end_time_from_mtime is set.
+        """
+        if gz_end_time_from_mtime:
+            try:
+                start_time = find_first_timestamp(_read_gz_head(file_path))
+            except OSError as e:
+                logger.debug(f"Failed to read head of {file_path}: {e}")
+                start_time = None
+            if start_time:
+                # Rotated logs are closed after their last write, so the mtime
+                # (kept on extraction) bounds the last line without inflating it
+                return start_time, datetime.fromtimestamp(file_path.stat().st_mtime)
+        
+        tail_count = 20  # Check last 20 lines
+        start_time = None
+        end_time = None
+        time_parser = LogTimeParser()
+        lines = self.read_log_file(file_path)
+        try:
+            for line in lines:
+                start_time = time_parser.parse(line)
+                if start_time:
+                    break
+        except Exception as e:
+            logger.debug(f"Failed to extract time range from {file_path}: {e}")
+        finally:
+            lines.close()
+        if start_time is None:
+            return None, None
+        
+        if gz_end_time_from_mtime:
+            return start_time, datetime.fromtimestamp(file_path.stat().st_mtime)
+        
+        # A file whose first timestamped line is among the last ones gets
+        # that line back as its end time
         try:
-            lines = list(self.read_log_file(file_path))
-            for line in reversed(lines[-20:]):  # Check last 20 lines
-                timestamp = self._parse_timestamp(line)
-                if timestamp:
-                    return timestamp
+            for line in reversed(_read_gz_tail_lines(file_path, tail_count)):
+                end_time = time_parser.parse(line)
+                if end_time:
+                    break
         except Exception as e:
-            logger.debug(f"Failed to extract end time from {file_path}: {e}")
+            logger.debug(f"Failed to extract time range from {file_path}: {e}")
         
-        return None
+        return start_time, end_time
     
     def _parse_timestamp(self, line: str) -> Optional[datetime]:
         """Parse timestamp from a log line."""
-        try:
-            # Handle different timestamp formats
-            if line.startswith(('I', 'W', 'E', 'F')):
-                # Format: I1231 10:30:45.123456
-                parts = line.split()
-                if len(parts) >= 2:
-                    time_str = parts[0][1:] + " " + parts[1][:5]
-                    return datetime.strptime(time_str, "%m%d %H:%M").replace(
-                        year=datetime.now().year
-                    )
-            else:
-                # Format: 2023-12-31 10:30:45.123456
-                parts = line.split()
-                if len(parts) >= 2:
-                    time_str = parts[0] + " " + parts[1]
-                    return datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S.%f")
-        except (ValueError, IndexError):
-            pass
-        
-        return None
+        # Fixed-offset slicing shared with the pattern matcher; no per-line
+        # split() or strptime()
+        return parse_log_timestamp(line)
     
     def _extract_node_name(self, file_path: Path) -> str:
         """Extract node name from file path."""
-        import re
-        
-        # Look for node patterns in the path
-        node_patterns = [
-            r"/(yb-[^/]*n\d+)/",
-            r"/(yb-(master|tserver)-\d+_[^/]+)/",
-            r"/([^/]+-node-\d+)/"
-        ]
-        
+        # Look for node patterns in the path, in priority order
         path_str = str(file_path)
-        for pattern in node_patterns:
-            match = re.search(pattern, path_str)
+        for pattern in NODE_NAME_PATTERNS:
+            match = pattern.search(path_str)
             if match:
                 return match.group(1).replace("/", "")
         
@@ -267,36 +755,8 @@ class FileProcessor:
     
     def _extract_log_type(self, file_path: Path) -> str:
         """Extract log type from file path."""
-        filename = file_path.name.lower()
-        
-        if "postgres" in filename:
-            return "postgres"
-        elif "controller" in filename:
-            return "yb-controller"
-        elif "tserver" in filename:
-            return "yb-tserver"
-        elif "master" in filename:
-            return "yb-master"
-        elif "application" in filename:
-            return "YBA"
-        else:
-            return "unknown"
+        return classify_log_file_name(file_path.name)[0]
     
     def _extract_sub_type(self, file_path: Path) -> str:
         """Extract sub type from file path."""
-        filename = file_path.name.upper()
-        
-        if "INFO" in filename:
-            return "INFO"
-        elif "WARN" in filename:
-            return "WARN"
-        elif "ERROR" in filename:
-            return "ERROR"
-        elif "FATAL" in filename:
-            return "FATAL"
-        elif "postgres" in file_path.name.lower():
-            return "INFO"
-        elif "application" in file_path.name.lower():
-            return "INFO"
-        else:
-            return "unknown"
\ No newline at end of file
+        return classify_log_file_name(file_path.name)[1]
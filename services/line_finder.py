@@ -0,0 +1,220 @@
+"""
+Candidate line finders for memory-mapped log files.
+
+A line finder scans a raw bytes buffer and yields the (start, end) offsets
+of lines that may match one of a set of patterns. Results are a superset:
+callers still verify each line with the original str patterns, and every
+line holding a non-ASCII byte is a candidate. Three
+backends are provided: a Hyperscan multi-pattern database and an RE2
+regex when the optional hyperscan or google-re2 packages are installed,
+and a bytes regex otherwise.
+"""
+
+import logging
+import re
+from typing import Iterator, List, Sequence, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional dependency
+    re2 = None
+
+
+logger = logging.getLogger(__name__)
+
+# Hyperscan scans line-aligned chunks of roughly this size
+HYPERSCAN_CHUNK_BYTES = 1024 * 1024
+
+# Matches any byte of a multi-byte UTF-8 character. Over bytes, "." or a
+# negated class takes one byte of such a character, "\w", "\s" and "\b"
+# are ASCII-only and case folding stops at ASCII, so the str patterns may
+# match lines the bytes patterns miss; those lines are always candidates.
+NON_ASCII_SOURCE = r"[\x80-\xff]"
+
+
+def _has_end_anchor(source: str) -> bool:
+    """
+    Return whether a regex source has a $ or \\Z anchor outside a character class.
+    
+    Over the raw buffer, $ only matches before "\\n" and \\Z only at the
+    end of the buffer, so on CRLF lines such patterns would miss lines the
+    str patterns match once "\\r" is stripped.
+    """
+    index = 0
+    in_class = False
+    while index < len(source):
+        char = source[index]
+        if char == "\\":
+            if not in_class and source[index + 1:index + 2] == "Z":
+                return True
+            index += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # "]" right after "[" or "[^" is literal
+            if source[index + 1:index + 2] == "^":
+                index += 1
+            if source[index + 1:index + 2] == "]":
+                index += 1
+        elif char == "$":
+            return True
+        index += 1
+    return False
+
+
+class RegexLineFinder:
+    """Line finder backed by a single bytes alternation regex."""
+    
+    def __init__(self, regex: re.Pattern):
+        self.regex = regex
+    
+    def iter_line_spans(self, buf) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (start, end) offsets of candidate lines, excluding the newline.
+        
+        Args:
+            buf: bytes-like buffer (e.g. an mmap) holding the file contents
+        """
+        search = self.regex.search
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            match = search(buf, pos)
+            if not match:
+                break
+            line_start = buf.rfind(b'\n', 0, match.start()) + 1
+            # A match may span a newline; restart the search after its first
+            # line so the following line is still scanned
+            line_end = buf.find(b'\n', line_start)
+            if line_end == -1:
+                line_end = size
+            yield line_start, line_end
+            pos = line_end + 1
+
+
+class Re2LineFinder(RegexLineFinder):
+    """
+    Line finder backed by an RE2 alternation regex.
+    
+    RE2 matches in linear time without backtracking, which keeps an
+    alternation of many patterns fast, and releases the GIL while searching.
+    """
+
+
+def _collect_match_end(pattern_id: int, start: int, end: int, flags: int, ends: List[int]) -> None:
+    """Hyperscan match callback: record where the match ended."""
+    ends.append(end)
+
+
+class HyperscanLineFinder:
+    """Line finder backed by a Hyperscan block-mode database."""
+    
+    def __init__(self, database):
+        self.database = database
+    
+    def iter_line_spans(self, buf) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (start, end) offsets of candidate lines, excluding the newline.
+        
+        The buffer is scanned in chunks that end on a newline, so no line is
+        split across two scans.
+        
+        Args:
+            buf: bytes-like buffer (e.g. an mmap) holding the file contents
+        """
+        scan = self.database.scan
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            chunk_end = size
+            if pos + HYPERSCAN_CHUNK_BYTES < size:
+                newline = buf.rfind(b'\n', pos, pos + HYPERSCAN_CHUNK_BYTES)
+                if newline == -1:
+                    newline = buf.find(b'\n', pos + HYPERSCAN_CHUNK_BYTES)
+                if newline != -1:
+                    chunk_end = newline + 1
+            chunk = buf[pos:chunk_end]
+            
+            ends: List[int] = []
+            scan(chunk, match_event_handler=_collect_match_end, context=ends)
+            
+            last_line_end = -1
+            for end in sorted(ends):
+                # Offset of the last byte of the match (or of an empty match)
+                offset = end - 1 if end > 0 else 0
+                if offset <= last_line_end:
+                    continue
+                line_start = chunk.rfind(b'\n', 0, offset) + 1
+                line_end = chunk.find(b'\n', line_start)
+                if line_end == -1:
+                    line_end = len(chunk)
+                last_line_end = line_end
+                yield pos + line_start, pos + line_end
+            pos = chunk_end
+
+
+def build_line_finder(sources: Sequence[str]):
+    """
+    Build the fastest available line finder for a list of regex sources.
+    
+    Patterns are matched case-insensitively with ^/$ anchored at line
+    boundaries, like the per-line str patterns they stand in for.
+    
+    Args:
+        sources: Regex pattern sources
+        
+    Returns:
+        HyperscanLineFinder, Re2LineFinder or RegexLineFinder, or None if the
+        patterns are not plain ASCII, anchor at a line end or cannot be
+        compiled as bytes
+    """
+    if not sources or not all(source.isascii() for source in sources):
+        return None
+    if any(_has_end_anchor(source) for source in sources):
+        # Line ends are matched on the decoded lines instead (see _has_end_anchor)
+        return None
+    sources = [*sources, NON_ASCII_SOURCE]
+    
+    if hyperscan is not None:
+        try:
+            database = hyperscan.Database()
+            flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_ALLOWEMPTY
+            database.compile(
+                expressions=[source.encode("ascii") for source in sources],
+                ids=list(range(len(sources))),
+                elements=len(sources),
+                flags=[flags] * len(sources)
+            )
+            return HyperscanLineFinder(database)
+        except Exception as e:
+            # Hyperscan rejects backreferences, lookarounds and similar
+            logger.debug(f"Hyperscan cannot compile patterns, using regex line finder: {e}")
+    
+    alternation = "|".join(f"(?:{source})" for source in sources)
+    if re2 is not None:
+        options = re2.Options()
+        options.case_sensitive = False
+        # Match bytes one to one, like the bytes regex below
+        options.encoding = re2.Options.Encoding.LATIN1
+        options.log_errors = False
+        try:
+            return Re2LineFinder(re2.compile(f"(?m){alternation}".encode("ascii"), options))
+        except re2.error as e:
+            # RE2 rejects backreferences and lookarounds
+            logger.debug(f"RE2 cannot compile patterns, using regex line finder: {e}")
+    
+    try:
+        regex = re.compile(
+            alternation.encode("ascii"),
+            re.IGNORECASE | re.MULTILINE
+        )
+    except re.error:
+        return None
+    return RegexLineFinder(regex)
@@ -0,0 +1,171 @@
+"""
+Per-line analysis kernel.
+
+This module holds the innermost loop of log analysis: timestamp filtering,
+pattern matching and per-pattern statistics. It is kept fully annotated and
+free of dynamic features so it can be compiled in place with mypyc
+(``mypyc services/match_kernel.py``); the compiled extension is picked up
+automatically and the pure Python module is used otherwise.
+"""
+
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.time_utils import GLOG_SEVERITIES, LogTimeParser, glog_prefix_bounds
+
+
+MinuteKey = Tuple[int, int, int, int, int]
+
+
+class PatternRecord:
+    """Running statistics for one pattern within a file."""
+    
+    __slots__ = ("first_seen", "last_seen", "count", "histogram")
+    
+    def __init__(self, timestamp: datetime, minute_key: MinuteKey):
+        self.first_seen: datetime = timestamp
+        self.last_seen: datetime = timestamp
+        self.count: int = 1
+        self.histogram: Counter = Counter({minute_key: 1})
+
+
+def first_matching_name(
+    line: str,
+    names: List[str],
+    compiled: List[re.Pattern],
+    combined_regex: Optional[re.Pattern],
+    literals: Optional[List[str]] = None,
+    literal_automaton: Optional[Any] = None
+) -> Optional[str]:
+    """
+    Return the name of the first pattern (in order) matching a line.
+    
+    Args:
+        line: Log line to match
+        names: Pattern names, in priority order
+        compiled: Compiled patterns, parallel to names
+        combined_regex: Optional alternation of all patterns with one named
+            group ``p<index>`` per pattern
+        literals: Optional lowercase literals, one of which every match
+            contains (see pattern_matcher.required_literals)
+        literal_automaton: Optional Aho-Corasick automaton mapping each
+            literal to the indices of the patterns requiring it; used with
+            literals to run only the patterns whose literal a line contains
+        
+    Returns:
+        Pattern name or None if no match
+    """
+    if literals is not None and line.isascii():
+        # Substring searches are far cheaper than the regex engine, and most
+        # lines contain none of the literals. Non-ASCII lines are left to the
+        # regex: case-insensitive matching folds some of them to ASCII.
+        lowered = line.lower()
+        if literal_automaton is not None:
+            candidates: Optional[Set[int]] = None
+            for _, indices in literal_automaton.iter(lowered):
+                if candidates is None:
+                    candidates = set(indices)
+                else:
+                    candidates.update(indices)
+            if candidates is None:
+                return None
+            for index in sorted(candidates):
+                if compiled[index].search(line):
+                    return names[index]
+            return None
+        for literal in literals:
+            if literal in lowered:
+                break
+        else:
+            return None
+    
+    if combined_regex is None:
+        for index in range(len(compiled)):
+            if compiled[index].search(line):
+                return names[index]
+        return None
+    
+    combined_match = combined_regex.search(line)
+    if combined_match is None:
+        return None
+    
+    lastgroup = combined_match.lastgroup
+    index = int(lastgroup[1:]) if lastgroup else 0
+    for earlier in range(index):
+        if compiled[earlier].search(line):
+            return names[earlier]
+    return names[index]
+
+
+def scan_lines(
+    lines: Iterable[str],
+    names: List[str],
+    compiled: List[re.Pattern],
+    combined_regex: Optional[re.Pattern],
+    start_time: datetime,
+    end_time: datetime,
+    records: Dict[str, PatternRecord],
+    progress_callback: Optional[Callable[[int], None]] = None,
+    literals: Optional[List[str]] = None,
+    literal_automaton: Optional[Any] = None
+) -> Dict[str, PatternRecord]:
+    """
+    Collect per-pattern statistics for the lines within a time window.
+    
+    Args:
+        lines: Log lines to scan
+        names: Pattern names, in priority order
+        compiled: Compiled patterns, parallel to names
+        combined_regex: Optional alternation of all patterns
+        start_time: Start of the analysis window
+        end_time: End of the analysis window
+        records: Dictionary of pattern names to PatternRecord, updated in
+            place so statistics gathered before an error are kept
+        progress_callback: Optional callback, called every 1000 lines
+        literals: Optional required literals of the patterns, used to skip
+            lines before running any regex
+        literal_automaton: Optional automaton over the literals, used to
+            pick the patterns to run on a line
+        
+    Returns:
+        The updated records
+    """
+    glog_lower, glog_upper = glog_prefix_bounds(start_time, end_time)
+    time_parser = LogTimeParser()
+    
+    line_num = 0
+    for line in lines:
+        if progress_callback is not None and line_num % 1000 == 0:
+            progress_callback(line_num)
+        line_num += 1
+        
+        # Cheap string compare on the glog "MMDD HH:MM" prefix first
+        if line[:1] in GLOG_SEVERITIES:
+            time_prefix = line[1:11]
+            if time_prefix < glog_lower or time_prefix > glog_upper:
+                continue
+        
+        timestamp = time_parser.parse(line)
+        if timestamp is None or timestamp < start_time or timestamp > end_time:
+            continue
+        
+        pattern_name = first_matching_name(line, names, compiled, combined_regex, literals, literal_automaton)
+        if pattern_name is None:
+            continue
+        
+        # Histogram is keyed by a plain tuple until the file is done
+        minute_key = (timestamp.year, timestamp.month, timestamp.day, timestamp.hour, timestamp.minute)
+        record = records.get(pattern_name)
+        if record is None:
+            records[pattern_name] = PatternRecord(timestamp, minute_key)
+        else:
+            if timestamp < record.first_seen:
+                record.first_seen = timestamp
+            elif timestamp > record.last_seen:
+                record.last_seen = timestamp
+            record.count += 1
+            record.histogram[minute_key] += 1
+    
+    return records
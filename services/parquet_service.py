@@ -6,27 +6,145 @@ with efficient querying and pattern matching capabilities.
 """
 
 import os
-import json
 import re
+import threading
 import time
+import traceback
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from collections import defaultdict
+from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 import logging
 
 import duckdb
 import glob
-import psycopg2
 
+from models.log_metadata import LogMessageStats, NodeAnalysisResult
 from utils.exceptions import AnalysisError
+from utils.json_utils import dump_json_file, load_json_file
 from config.settings import settings
-from services.database_service import DatabaseService
 
 
 # Use the same logger as the main application
 logger = logging.getLogger("log_analyzer")
 
+# Long operation message prefix cleanup, compiled once
+PARENTHESIZED_ID_RE = re.compile(r'\([^)]+\)')
+TRAILING_PUNCTUATION_RE = re.compile(r'[:;]+$')
+
+# In-memory DuckDB database shared by all queries of the process, created on
+# first use; see _duckdb_cursor
+_duckdb_connection: Optional[duckdb.DuckDBPyConnection] = None
+_duckdb_connection_lock = threading.Lock()
+
+
+def build_row_filter(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    node_filter: Optional[List[str]] = None,
+    log_type_filter: Optional[List[str]] = None
+) -> Tuple[str, List[Any]]:
+    """
+    Build a SQL predicate restricting Parquet rows by time, node and log type.
+    
+    The predicate compares the raw columns against bound constants, so DuckDB
+    can skip whole row groups using the Parquet min/max statistics instead of
+    decoding them.
+    
+    Args:
+        start_time: Earliest timestamp to include
+        end_time: Last minute to include (the whole minute is included)
+        node_filter: Node names to include
+        log_type_filter: Log types to include (e.g. "tserver")
+        
+    Returns:
+        Tuple of (" AND ..." clause, or "" without filters, parameters)
+    """
+    clauses = []
+    params: List[Any] = []
+    if start_time is not None:
+        clauses.append('"timestamp" >= CAST(? AS TIMESTAMP)')
+        params.append(start_time)
+    if end_time is not None:
+        clauses.append('"timestamp" < CAST(? AS TIMESTAMP)')
+        params.append(end_time.replace(second=0, microsecond=0) + timedelta(minutes=1))
+    if node_filter:
+        clauses.append(f"node_name IN ({', '.join('?' for _ in node_filter)})")
+        params.extend(node_filter)
+    if log_type_filter:
+        clauses.append(f"log_type IN ({', '.join('?' for _ in log_type_filter)})")
+        params.extend(log_type_filter)
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+def _rollup_minutes_sql(minute_sql: str) -> str:
+    """
+    Wrap a per-minute aggregation query into one row per node, log type and pattern.
+    
+    Args:
+        minute_sql: Query returning node_name, log_type, pattern, start_time,
+            end_time, minute and minute_count rows
+        
+    Returns:
+        Query returning (node_name, log_type, pattern, start_time, end_time,
+        count, minutes, minute_counts) rows ordered by node, log type and
+        pattern, with the minutes in order. Two lists convert to Python
+        several times faster than a MAP.
+    """
+    return f"""
+        SELECT node_name, log_type, pattern,
+               MIN(start_time) AS start_time,
+               MAX(end_time) AS end_time,
+               SUM(minute_count)::BIGINT AS count,
+               list(minute ORDER BY minute) AS minutes,
+               list(minute_count ORDER BY minute) AS minute_counts
+        FROM ({minute_sql}) AS minutes
+        GROUP BY node_name, log_type, pattern
+        ORDER BY node_name, log_type, pattern
+    """
+
+
+def _duckdb_cursor() -> duckdb.DuckDBPyConnection:
+    """
+    Open a cursor on the process-wide DuckDB connection.
+    
+    Queries share one database instead of each paying for a new one, and
+    Parquet footers read by one query (e.g. the bundle name lookup) are
+    cached for the next scans of the same files. Each query, or thread, gets
+    its own cursor; closing it leaves the shared connection open.
+    """
+    global _duckdb_connection
+    with _duckdb_connection_lock:
+        if _duckdb_connection is None:
+            connection = duckdb.connect()
+            connection.execute("SET parquet_metadata_cache = true")
+            _duckdb_connection = connection
+        return _duckdb_connection.cursor()
+
+
+@lru_cache(maxsize=8192)
+def _parse_dt(value: Any) -> datetime:
+    """
+    Parse a StartTime/EndTime value that is not already a datetime (cached).
+    
+    Accepts ISO strings (a trailing Z is dropped, keeping the result naive)
+    and DuckDB's "YYYY-MM-DD HH:MM:SS" format; None, non-strings and
+    unparsable values map to datetime.min. Many patterns share start and
+    end times, hence the cache.
+    """
+    if not isinstance(value, str):
+        return datetime.min
+    try:
+        # fromisoformat (C, Python 3.11+) takes both "T" and " " separators
+        return datetime.fromisoformat(value[:-1] if value.endswith("Z") else value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.strptime(value[:19], "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return datetime.min
+
 
 class ParquetAnalysisService:
     """Service for analyzing Parquet files."""
@@ -37,15 +155,13 @@ class ParquetAnalysisService:
     def get_default_patterns(self) -> List[str]:
         """Get default patterns for Parquet analysis."""
         try:
-            import yaml
-            
             config_path = settings.log_conf_path
             if not config_path.exists():
                 logger.warning(f"Pattern configuration file not found: {config_path}")
                 return []
             
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            # Parsed once and shared with the pattern matcher
+            config = settings.load_log_config()
             
             patterns = []
             
@@ -78,7 +194,7 @@ class ParquetAnalysisService:
         """
         parquet_path = str(parquet_dir / "*.parquet")
         try:
-            con = duckdb.connect()
+            con = _duckdb_cursor()
             bundle_sql = f"SELECT support_bundle FROM '{parquet_path}' LIMIT 1"
             bundle_row = con.execute(bundle_sql).fetchone()
             con.close()
@@ -91,82 +207,75 @@ class ParquetAnalysisService:
         self,
         parquet_dir: Path,
         patterns: List[str],
-        num_threads: int = 10
+        num_threads: int = 10,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        node_filter: Optional[List[str]] = None,
+        log_type_filter: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
-        Optimized: Analyze Parquet files for log patterns using DuckDB aggregation, running queries in parallel for each pattern.
+        Optimized: Analyze Parquet files for log patterns using DuckDB aggregation, matching all patterns in a single scan.
         Args:
             parquet_dir: Directory containing Parquet files
             patterns: List of regex patterns to search for
+            num_threads: Number of DuckDB threads
+            start_time: Optional earliest timestamp to analyze
+            end_time: Optional last minute to analyze
+            node_filter: Optional node names to analyze
+            log_type_filter: Optional log types to analyze (e.g. "tserver")
         Returns:
             Dictionary with analysis results
         Raises:
             AnalysisError: If analysis fails
         """
-        import concurrent.futures
         start_total = time.time()
         try:
-            logger.info(f"🚀 Starting Parquet analysis (DuckDB aggregation, parallel with {num_threads} threads)...")
+            logger.info(f"🚀 Starting Parquet analysis (DuckDB aggregation with {num_threads} threads)...")
             bundle_name = self.get_bundle_name_from_parquet(parquet_dir)
             parquet_path = str(parquet_dir / "*.parquet")
             node_results = {}
+            # Pushed down into every scan so filtered-out row groups are skipped
+            row_filter = build_row_filter(start_time, end_time, node_filter, log_type_filter)
 
-            def run_pattern_query(pattern):
-                import duckdb
-                safe_pattern = pattern.replace("'", "''").replace("\\", "\\\\")
-                sql = f"""
-                    SELECT node_name, log_type,
-                           MIN(timestamp) AS start_time,
-                           MAX(timestamp) AS end_time,
-                           COUNT(*) AS total_count,
-                           strftime(timestamp, '%Y-%m-%dT%H:%M:00Z') AS minute,
-                           COUNT(*) AS minute_count
-                    FROM '{parquet_path}'
-                    WHERE node_name IS NOT NULL AND REGEXP_MATCHES(message, '(?i){safe_pattern}')
-                    GROUP BY node_name, log_type, minute
-                """
-                logger.info(f"DuckDB aggregation for pattern: {pattern}")
-                con = duckdb.connect()
-                rows = con.execute(sql).fetchall()
-                con.close()
-                return pattern, rows
+            # The long operations scan is independent of the pattern scan and
+            # DuckDB releases the GIL, so it runs alongside the pattern query
+            # and the aggregation loop below. Long operations are reported
+            # per universe, not per log type.
+            long_ops_executor = ThreadPoolExecutor(max_workers=1)
+            long_ops_future = long_ops_executor.submit(
+                self.get_long_operations_data,
+                parquet_dir, build_row_filter(start_time, end_time, node_filter)
+            )
+            long_ops_executor.shutdown(wait=False)
 
-            # Use ThreadPoolExecutor for parallel pattern queries
-            with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
-                future_to_pattern = {executor.submit(run_pattern_query, pattern): pattern for pattern in patterns}
-                for future in concurrent.futures.as_completed(future_to_pattern):
-                    pattern = future_to_pattern[future]
-                    try:
-                        pattern, rows = future.result()
-                        for row in rows:
-                            node_name, log_type, start_time, end_time, total_count, minute, minute_count = row
-                            if node_name not in node_results:
-                                node_results[node_name] = {}
-                            if log_type not in node_results[node_name]:
-                                node_results[node_name][log_type] = {"logMessages": {}}
-                            log_messages = node_results[node_name][log_type]["logMessages"]
-                            if pattern not in log_messages:
-                                log_messages[pattern] = {
-                                    "StartTime": start_time,
-                                    "EndTime": end_time,
-                                    "count": 0,
-                                    "histogram": {}
-                                }
-                            log_messages[pattern]["count"] += minute_count
-                            log_messages[pattern]["histogram"][minute] = minute_count
-                            if log_messages[pattern]["StartTime"] is None or start_time < log_messages[pattern]["StartTime"]:
-                                log_messages[pattern]["StartTime"] = start_time
-                            if log_messages[pattern]["EndTime"] is None or end_time > log_messages[pattern]["EndTime"]:
-                                log_messages[pattern]["EndTime"] = end_time
-                    except Exception as exc:
-                        logger.error(f"Pattern {pattern} generated an exception: {exc}")
+            try:
+                rows = self._query_pattern_matches(parquet_path, patterns, num_threads, row_filter)
+            except duckdb.Error as e:
+                # A pattern RE2 cannot compile fails the whole single-scan
+                # query; per-pattern queries isolate it
+                logger.warning(f"Single-scan pattern query failed, querying patterns one by one: {e}")
+                rows = self._query_each_pattern(parquet_path, patterns, num_threads, row_filter)
+
+            # One row per (node, log type, pattern), with its minutes and
+            # their counts already collected in order by DuckDB
+            for node_name, log_type, pattern, start_time, end_time, count, minutes, minute_counts in rows:
+                node_data = node_results.setdefault(node_name, {})
+                log_type_data = node_data.get(log_type)
+                if log_type_data is None:
+                    log_type_data = node_data[log_type] = {"logMessages": {}}
+                log_type_data["logMessages"][pattern] = {
+                    "StartTime": start_time,
+                    "EndTime": end_time,
+                    "count": count,
+                    "histogram": dict(zip(minutes, minute_counts))
+                }
 
             total_time = time.time() - start_total
-            logger.info(f"✅ DuckDB aggregation (parallel) completed in {total_time:.2f} seconds.")
+            logger.info(f"✅ DuckDB aggregation completed in {total_time:.2f} seconds.")
             
             # Collect long operations data
             logger.info("📊 Collecting long operations data from parquet files...")
-            long_ops_data = self.get_long_operations_data(parquet_dir)
+            long_ops_data = long_ops_future.result()
             
             result = {
                 "nodes": node_results,
@@ -177,116 +286,154 @@ class ParquetAnalysisService:
         except Exception as e:
             raise AnalysisError(f"Parquet analysis failed: {e}")
     
-    def _build_pattern_filters(self, patterns: List[str]) -> List[str]:
-        """Build SQL pattern filters for DuckDB query."""
-        pattern_filters = []
+    def build_report_nodes(
+        self,
+        nodes: Dict[str, Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, NodeAnalysisResult]]:
+        """
+        Convert the "nodes" of an analysis result into report objects.
+        
+        Start and end times from analyze_parquet_files are already datetimes
+        and are used as is; only other values (e.g. ISO strings of a result
+        loaded from JSON) are parsed. Histograms are shared, not copied.
         
+        Args:
+            nodes: Per node and log type results, as in analyze_parquet_files
+            
+        Returns:
+            NodeAnalysisResult per node and log type
+        """
+        converted_nodes: Dict[str, Dict[str, NodeAnalysisResult]] = {}
+        for node_name, node_data in nodes.items():
+            node_results = converted_nodes[node_name] = {}
+            for log_type, log_type_data in node_data.items():
+                log_messages = {}
+                for pattern_name, message_data in log_type_data.get("logMessages", {}).items():
+                    start_time = message_data.get("StartTime")
+                    end_time = message_data.get("EndTime")
+                    if type(start_time) is not datetime:
+                        start_time = _parse_dt(start_time)
+                    if type(end_time) is not datetime:
+                        end_time = _parse_dt(end_time)
+                    # Positional, in field order: pattern_name, start_time,
+                    # end_time, count, histogram
+                    log_messages[pattern_name] = LogMessageStats(
+                        pattern_name, start_time, end_time,
+                        message_data["count"], message_data["histogram"]
+                    )
+                node_results[log_type] = NodeAnalysisResult(node_name, log_type, log_messages)
+        return converted_nodes
+    
+    def _query_pattern_matches(
+        self,
+        parquet_path: str,
+        patterns: List[str],
+        num_threads: int,
+        row_filter: Tuple[str, List[Any]] = ("", [])
+    ) -> List[tuple]:
+        """
+        Count pattern matches per node, log type and minute in one Parquet scan.
+        
+        Rows are prefiltered with a single alternation of all patterns, then
+        tagged with every pattern they match and unnested, so DuckDB does the
+        matching and aggregation without a Python pass over the rows. The
+        per-minute counts are rolled up into one row per node, log type and
+        pattern, so only the finished statistics are fetched. Patterns
+        are bound as parameters: each regex is a constant (compiled once) and
+        needs no SQL escaping. Timestamps are cast to TIMESTAMP in the scan, so
+        start and end times are always datetimes whatever type the files
+        store; rows without a valid timestamp are skipped.
+        
+        Args:
+            parquet_path: Glob of the Parquet files
+            patterns: List of regex patterns to search for
+            num_threads: Number of DuckDB threads for this query
+            row_filter: Row predicate and parameters from build_row_filter
+            
+        Returns:
+            Rows of (node_name, log_type, pattern, start_time, end_time, count,
+            minutes, minute_counts), ordered by node, log type and pattern,
+            with the minutes of each row in order
+        """
+        if not patterns:
+            return []
+        pattern_tags = ", ".join("CASE WHEN REGEXP_MATCHES(message, ?, 'i') THEN ? END" for _ in patterns)
+        sql = _rollup_minutes_sql(f"""
+            SELECT node_name, log_type, pattern,
+                   MIN(ts) AS start_time,
+                   MAX(ts) AS end_time,
+                   strftime(ts, '%Y-%m-%dT%H:%M:00Z') AS minute,
+                   COUNT(*) AS minute_count
+            FROM (
+                SELECT node_name, log_type, TRY_CAST(timestamp AS TIMESTAMP) AS ts,
+                       UNNEST(list_filter([{pattern_tags}], p -> p IS NOT NULL)) AS pattern
+                FROM '{parquet_path}'
+                WHERE node_name IS NOT NULL AND REGEXP_MATCHES(message, ?, 'i'){row_filter[0]}
+            )
+            WHERE ts IS NOT NULL
+            GROUP BY node_name, log_type, pattern, minute
+        """)
+        params = []
         for pattern in patterns:
-            # Escape single quotes and backslashes for SQL
-            safe_pattern = pattern.replace("'", "''").replace("\\", "\\\\")
-            pattern_filters.append(f"REGEXP_MATCHES(message, '(?i){safe_pattern}')")
+            params.extend([pattern, pattern])
+        params.append("|".join(f"(?:{pattern})" for pattern in patterns))
+        params.extend(row_filter[1])
         
-        return pattern_filters
+        # The thread count is a setting of the whole database, so this query
+        # gets a database of its own rather than changing the shared one,
+        # which the long operations scan uses at the same time
+        con = duckdb.connect(config={"threads": max(1, int(num_threads))})
+        try:
+            return con.execute(sql, params).fetchall()
+        finally:
+            con.close()
     
-    def _process_query_results(
-        self, 
-        rows: List[tuple], 
-        patterns: List[str]
-    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
-        """Process query results and build node-based statistics with a progress bar."""
-        import time
-        from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
-
-        node_proc_pat = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-
-        # Filter out empty patterns to prevent blank message matches
-        valid_patterns = [pattern for pattern in patterns if pattern and pattern.strip()]
-
-        # Use actual pattern names instead of generic pattern_X names
-        pattern_name_map = {pattern: pattern for pattern in valid_patterns}
-
-        logger.info("🔄 Processing rows for pattern matching...")
-
-        # Track pattern matching timing
-        start_pattern_matching = time.time()
-        pattern_matches = 0
-        total_rows = len(rows)
-        blank_messages_skipped = 0
-
-        with Progress(
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            "[progress.percentage]{task.percentage:>3.0f}%",
-            "{task.completed}/{task.total}",
-            TimeElapsedColumn(),
-            TimeRemainingColumn(),
-            transient=True,
-        ) as progress:
-            task = progress.add_task("Processing rows", total=total_rows)
-            for idx, (node_name, log_type, timestamp, message) in enumerate(rows):
-                if idx % 1000 == 0 and idx > 0:
-                    progress.update(task, advance=1000)
-                # Enhanced filtering for blank messages
-                if not message or message.strip() == "" or message.isspace():
-                    blank_messages_skipped += 1
-                    continue
-                # Match patterns
-                for pattern in valid_patterns:
-                    if re.search(pattern, message):
-                        pattern_name = pattern_name_map.get(pattern, pattern)
-                        node_proc_pat[node_name][log_type][pattern_name].append(timestamp)
-                        pattern_matches += 1
-                        break  # Only match first pattern
-            # Advance any remaining
-            progress.update(task, completed=total_rows)
-
-        pattern_matching_time = time.time() - start_pattern_matching
-        # Log blank message count for debugging
-        if blank_messages_skipped > 0:
-            logger.info(f"⚠️  Skipped {blank_messages_skipped} blank/empty messages during processing")
-
-        # Build final results
-        start_building_results = time.time()
-        result = {}
-
-        for node_name in node_proc_pat:
-            result[node_name] = {}
-            for proc in self.process_types:
-                log_messages = {}
-                proc_data = node_proc_pat[node_name].get(proc, {})
-                for pattern_name, timestamps in proc_data.items():
-                    if timestamps:
-                        times = sorted(timestamps)
-                        start_time = times[0]
-                        end_time = times[-1]
-                        total_count = len(times)
-                        histogram = defaultdict(int)
-                        for t in times:
-                            if isinstance(t, datetime):
-                                minute = t.replace(second=0, microsecond=0)
-                                minute_str = minute.strftime('%Y-%m-%dT%H:%M:00Z')
-                            else:
-                                dt = datetime.strptime(str(t)[:19], "%Y-%m-%d %H:%M:%S")
-                                minute = dt.replace(second=0, microsecond=0)
-                                minute_str = minute.strftime('%Y-%m-%dT%H:%M:00Z')
-                            histogram[minute_str] += 1
-                        def iso(dt):
-                            if isinstance(dt, datetime):
-                                return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-                            else:
-                                return str(dt)[:19].replace(' ', 'T') + 'Z'
-                        log_messages[pattern_name] = {
-                            "StartTime": iso(start_time),
-                            "EndTime": iso(end_time),
-                            "count": total_count,
-                            "histogram": dict(histogram)
-                        }
-                result[node_name][proc] = {"logMessages": log_messages}
+    def _query_each_pattern(
+        self,
+        parquet_path: str,
+        patterns: List[str],
+        num_threads: int,
+        row_filter: Tuple[str, List[Any]] = ("", [])
+    ) -> List[tuple]:
+        """
+        Fallback for _query_pattern_matches: one aggregation query per pattern, in parallel.
+        
+        Each pattern's rows are kept together and ordered by node and log
+        type, in the same shape as the rows of the single-scan query.
+        """
 
-        building_results_time = time.time() - start_building_results
-        logger.info(f"📊 Results building completed in {building_results_time:.2f} seconds.")
+        def run_pattern_query(pattern):
+            sql = _rollup_minutes_sql(f"""
+                SELECT node_name, log_type, ? AS pattern,
+                       MIN(ts) AS start_time,
+                       MAX(ts) AS end_time,
+                       strftime(ts, '%Y-%m-%dT%H:%M:00Z') AS minute,
+                       COUNT(*) AS minute_count
+                FROM (
+                    SELECT node_name, log_type, TRY_CAST(timestamp AS TIMESTAMP) AS ts
+                    FROM '{parquet_path}'
+                    WHERE node_name IS NOT NULL AND REGEXP_MATCHES(message, ?, 'i'){row_filter[0]}
+                )
+                WHERE ts IS NOT NULL
+                GROUP BY node_name, log_type, minute
+            """)
+            logger.info(f"DuckDB aggregation for pattern: {pattern}")
+            con = _duckdb_cursor()
+            try:
+                return con.execute(sql, [pattern, pattern, *row_filter[1]]).fetchall()
+            finally:
+                con.close()
 
-        return result
+        rows = []
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            future_to_pattern = {executor.submit(run_pattern_query, pattern): pattern for pattern in patterns}
+            for future in as_completed(future_to_pattern):
+                pattern = future_to_pattern[future]
+                try:
+                    rows.extend(future.result())
+                except Exception as exc:
+                    logger.error(f"Pattern {pattern} generated an exception: {exc}")
+        return rows
     
     def save_results(self, result: Dict[str, Any], output_path: Path) -> None:
         """
@@ -298,21 +445,18 @@ class ParquetAnalysisService:
             AnalysisError: If saving fails
         """
         def convert(obj):
-            if isinstance(obj, dict):
-                return {k: convert(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert(v) for v in obj]
-            elif isinstance(obj, tuple):
-                return tuple(convert(v) for v in obj)
-            elif hasattr(obj, 'isoformat'):
+            # Only called for values the serializer does not handle natively
+            if hasattr(obj, 'isoformat'):
                 return obj.isoformat()
-            else:
-                return obj
+            if hasattr(obj, 'tolist'):
+                # numpy values, when orjson is not installed
+                return obj.tolist()
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            serializable_result = convert(result)
-            with open(output_path, "w") as f:
-                json.dump(serializable_result, f, indent=2)
+            # Written node by node, so the serialized JSON of only one node
+            # is held in memory at a time
+            dump_json_file(output_path, result, indent=True, default=convert, stream_depth=2)
         except Exception as e:
             raise AnalysisError(f"Failed to save results: {e}")
     
@@ -330,13 +474,16 @@ class ParquetAnalysisService:
             AnalysisError: If loading fails
         """
         try:
-            with open(output_path, "r") as f:
-                return json.load(f)
+            return load_json_file(output_path)
                 
         except Exception as e:
             raise AnalysisError(f"Failed to load results: {e}")
     
-    def get_long_operations_data(self, parquet_dir: Path) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    def get_long_operations_data(
+        self,
+        parquet_dir: Path,
+        row_filter: Tuple[str, List[Any]] = ("", [])
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
         """
         Collect long operations data from Parquet files.
         
@@ -351,6 +498,7 @@ class ParquetAnalysisService:
         
         Args:
             parquet_dir: Directory containing Parquet files
+            row_filter: Row predicate and parameters from build_row_filter
             
         Returns:
             Nested dictionary structure:
@@ -422,64 +570,65 @@ class ParquetAnalysisService:
                         COALESCE(long_op_value, timing_real_value) AS op_value
                     FROM '{escaped_path}'
                     WHERE (long_op_value IS NOT NULL OR timing_real_value IS NOT NULL)
-                      AND (message LIKE '%took a long%' OR message LIKE 'Time spent%')
+                      AND (message LIKE '%took a long%' OR message LIKE 'Time spent%'){row_filter[0]}
                 )
                 WHERE message_prefix IS NOT NULL
                   AND op_value IS NOT NULL
                   AND LENGTH(TRIM(message_prefix)) > 0
             """
             
-            con = duckdb.connect()
-            rows = con.execute(sql).fetchall()
-            con.close()
-            
-            # Group by message_prefix first, then by 10-minute time buckets, calculate aggregates
-            grouped_data = defaultdict(lambda: defaultdict(list))
+            # Clean up message prefixes, bucket and aggregate in DuckDB:
+            # - trim whitespace and remove IDs in parentheses (e.g.
+            #   "running LogGCOp(fab8633b...)" -> "running LogGCOp") so
+            #   operations with different IDs group together
+            # - remove trailing colons and other punctuation
+            # - bucket to 10-minute intervals formatted as 'YYYY-MM-DD HH:MM:00'
+            whitespace = "'^\\s+|\\s+$'"
+            aggregate_sql = f"""
+                WITH long_ops AS ({sql}),
+                without_ids AS (
+                    SELECT TRY_CAST("timestamp" AS TIMESTAMP) AS ts,
+                           op_value,
+                           regexp_replace(
+                               regexp_replace(regexp_replace(message_prefix, {whitespace}, '', 'g'), ?, '', 'g'),
+                               {whitespace}, '', 'g'
+                           ) AS message_prefix
+                    FROM long_ops
+                ),
+                cleaned AS (
+                    SELECT ts,
+                           op_value,
+                           regexp_replace(regexp_replace(message_prefix, ?, ''), {whitespace}, '', 'g') AS message_prefix
+                    FROM without_ids
+                    WHERE ts IS NOT NULL
+                )
+                SELECT message_prefix,
+                       strftime(time_bucket(INTERVAL '10 minutes', ts), '%Y-%m-%d %H:%M:00') AS time_interval,
+                       COUNT(*) AS c,
+                       AVG(op_value) AS avg,
+                       MAX(op_value) AS max
+                FROM cleaned
+                GROUP BY message_prefix, time_interval
+                ORDER BY message_prefix, time_interval
+            """
             
-            for row in rows:
-                timestamp, file, message_prefix, op_value = row
-                if timestamp and message_prefix and op_value is not None:
-                    # Convert timestamp to datetime if needed
-                    if isinstance(timestamp, str):
-                        try:
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        except:
-                            continue
-                    elif isinstance(timestamp, datetime):
-                        dt = timestamp
-                    else:
-                        continue
-                    
-                    # Clean up message prefix: trim whitespace and normalize common patterns
-                    message_prefix = message_prefix.strip()
-                    
-                    # Remove IDs in parentheses (e.g., "running LogGCOp(fab8633b...)" -> "running LogGCOp")
-                    # This groups operations with different IDs together
-                    message_prefix = re.sub(r'\([^)]+\)', '', message_prefix)
-                    message_prefix = message_prefix.strip()
-                    
-                    # Remove trailing colons and other punctuation
-                    message_prefix = re.sub(r'[:;]+$', '', message_prefix).strip()
-                    
-                    # Bucket to 10-minute intervals: round down to nearest 10 minutes
-                    bucket_minute = (dt.minute // 10) * 10
-                    time_bucket = dt.replace(minute=bucket_minute, second=0, microsecond=0)
-                    # Format to match user's expected format: 'YYYY-MM-DD HH:MM:00'
-                    time_key = time_bucket.strftime('%Y-%m-%d %H:%M:00')
-                    
-                    grouped_data[message_prefix][time_key].append(op_value)
+            con = _duckdb_cursor()
+            try:
+                rows = con.execute(
+                    aggregate_sql, [*row_filter[1], PARENTHESIZED_ID_RE.pattern, TRAILING_PUNCTUATION_RE.pattern]
+                ).fetchall()
+            finally:
+                con.close()
             
             # Build nested result structure with optimized field names
+            # (c=count, avg=average, max=maximum); rows arrive sorted
             result = {}
-            for message_prefix, time_intervals in sorted(grouped_data.items()):
-                result[message_prefix] = {}
-                for time_interval, values in sorted(time_intervals.items()):
-                    if values:  # Only add if we have values
-                        result[message_prefix][time_interval] = {
-                            "c": len(values),  # count
-                            "avg": sum(values) / len(values),  # average
-                            "max": max(values)  # maximum
-                        }
+            for message_prefix, time_interval, count, average, maximum in rows:
+                result.setdefault(message_prefix, {})[time_interval] = {
+                    "c": count,
+                    "avg": average,
+                    "max": maximum
+                }
             
             total_records = sum(len(intervals) for intervals in result.values())
             logger.info(f"Collected {total_records} long operations records across {len(result)} message prefixes")
@@ -490,7 +639,6 @@ class ParquetAnalysisService:
             
         except Exception as e:
             logger.warning(f"Failed to collect long operations data: {e}")
-            import traceback
             logger.debug(traceback.format_exc())
             return []
     
@@ -517,7 +665,7 @@ class ParquetAnalysisService:
             # Try to get schema info from first file
             schema_info = {}
             try:
-                con = duckdb.connect()
+                con = _duckdb_cursor()
                 schema_sql = f"DESCRIBE SELECT * FROM '{parquet_files[0]}' LIMIT 0"
                 schema_result = con.execute(schema_sql).fetchall()
                 con.close()
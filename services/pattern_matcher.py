@@ -6,19 +6,241 @@ statistics from log files with proper error handling and performance optimizatio
 """
 
 import re
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any, Union
 from datetime import datetime
 import logging
 from collections import defaultdict
 from pathlib import Path
 import json
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
 from models.log_metadata import LogMessageStats
+from services.line_finder import build_line_finder
+from services.match_kernel import PatternRecord, first_matching_name, scan_lines
 from config.settings import settings
+from utils.time_utils import parse_log_timestamp
 
 
 logger = logging.getLogger(__name__)
 
+# Group references that would point at the wrong group once a pattern is
+# embedded in a larger alternation (numbered backreferences, conditionals)
+GROUP_REFERENCE_RE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(")
+
+
+# Characters that form a literal run in a pattern source
+LITERAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_ ")
+# Shortest required literal worth testing with a substring search
+MIN_LITERAL_LENGTH = 3
+# Escapes spelling a character with more than one source character (hex,
+# unicode, named, octal); the parse gives up on patterns using them rather
+# than read their digits or names as literal text
+MULTI_CHAR_ESCAPES = frozenset("xuUN0123456789")
+# A counted repetition, whose digits are not literal text
+REPEAT_RE = re.compile(r"\{\d*(?:,\d*)?\}")
+
+
+def required_literals(pattern: re.Pattern) -> Optional[List[str]]:
+    """
+    Find lowercase literals one of which every match of a pattern contains.
+    
+    Each top-level alternative of the pattern contributes its longest run
+    of plain characters outside any group. The parse stays conservative:
+    verbose patterns, patterns with multi-character escapes (e.g. ``\x41``),
+    alternatives without such a run and runs made optional by a quantifier
+    yield no literal.
+    
+    Args:
+        pattern: Compiled pattern
+        
+    Returns:
+        One literal per top-level alternative, or None if an alternative
+        has no required literal
+    """
+    if pattern.flags & re.VERBOSE:
+        return None
+    
+    source = pattern.pattern
+    literals: List[str] = []
+    runs: List[str] = []
+    run = ""
+    depth = 0
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if depth == 0 and char in LITERAL_CHARS:
+            next_char = source[index + 1:index + 2]
+            if next_char and next_char in "?*{":
+                # The character is optional (or repeated from zero)
+                runs.append(run)
+                run = ""
+            else:
+                run += char
+            index += 1
+            continue
+        
+        runs.append(run)
+        run = ""
+        if char == "\\":
+            if source[index + 1:index + 2] in MULTI_CHAR_ESCAPES:
+                return None
+            index += 2
+            continue
+        if char == "{":
+            repeat = REPEAT_RE.match(source, index)
+            if repeat:
+                index = repeat.end()
+                continue
+        if char == "[":
+            # Skip the character class; "]" right after "[" or "[^" is literal
+            index += 1
+            if source[index:index + 1] == "^":
+                index += 1
+            if source[index:index + 1] == "]":
+                index += 1
+            while index < len(source) and source[index] != "]":
+                index += 2 if source[index] == "\\" else 1
+            index += 1
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            literal = max(runs, key=len)
+            if len(literal) < MIN_LITERAL_LENGTH:
+                return None
+            literals.append(literal.lower())
+            runs = []
+        index += 1
+    runs.append(run)
+    
+    literal = max(runs, key=len)
+    if len(literal) < MIN_LITERAL_LENGTH:
+        return None
+    literals.append(literal.lower())
+    return literals
+
+
+def build_literal_automaton(literals: List[List[str]]) -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton over the required literals of patterns.
+    
+    A single pass of the automaton over a lowercased line yields, for every
+    literal found, the indices of the patterns requiring it; only those
+    patterns can match the line.
+    
+    Args:
+        literals: Required literals of each pattern (see required_literals),
+            in pattern order
+        
+    Returns:
+        Automaton mapping each literal to a tuple of pattern indices, or
+        None if the optional pyahocorasick package is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    indices_by_literal: Dict[str, List[int]] = {}
+    for index, pattern_literals in enumerate(literals):
+        for literal in dict.fromkeys(pattern_literals):
+            indices_by_literal.setdefault(literal, []).append(index)
+    
+    automaton = ahocorasick.Automaton()
+    for literal, indices in indices_by_literal.items():
+        automaton.add_word(literal, tuple(indices))
+    automaton.make_automaton()
+    return automaton
+
+
+class CombinedPattern(NamedTuple):
+    """A set of patterns fused into a single alternation regex."""
+    regex: re.Pattern
+    names: List[str]
+    patterns: List[re.Pattern]
+    # Locates candidate lines in a memory-mapped file (Hyperscan or a bytes
+    # regex); None if the patterns are not plain ASCII
+    line_finder: Optional[Any] = None
+    # Lowercase literals, one of which every match contains; None unless
+    # every pattern has a required literal
+    literals: Optional[List[str]] = None
+    # Aho-Corasick automaton over the literals, dispatching each line to the
+    # patterns whose literal it contains (requires pyahocorasick)
+    literal_automaton: Optional[Any] = None
+
+
+def build_combined_pattern(patterns: Dict[str, re.Pattern]) -> Optional[CombinedPattern]:
+    """
+    Fuse compiled patterns into one alternation with a named group per pattern.
+    
+    A single search of the combined regex tells whether any pattern matches a
+    line, which is the common (no match) case for the vast majority of lines.
+    Each pattern is wrapped in a non-capturing group so alternations inside a
+    pattern stay scoped to it.
+    
+    Args:
+        patterns: Dictionary of pattern names to compiled patterns
+        
+    Returns:
+        CombinedPattern, or None if the patterns cannot be combined (e.g. they
+        use backreferences or conflicting group names)
+    """
+    if not patterns:
+        return None
+    
+    names = list(patterns.keys())
+    compiled = list(patterns.values())
+    if any(GROUP_REFERENCE_RE.search(pattern.pattern) for pattern in compiled):
+        return None
+    alternation = "|".join(
+        f"(?P<p{index}>(?:{pattern.pattern}))" for index, pattern in enumerate(compiled)
+    )
+    try:
+        regex = re.compile(alternation, re.IGNORECASE)
+    except re.error as e:
+        logger.debug(f"Falling back to per-pattern matching, cannot combine patterns: {e}")
+        return None
+    
+    line_finder = build_line_finder([pattern.pattern for pattern in compiled])
+    literals = [required_literals(pattern) for pattern in compiled]
+    if None in literals:
+        return CombinedPattern(regex=regex, names=names, patterns=compiled, line_finder=line_finder)
+    
+    return CombinedPattern(
+        regex=regex,
+        names=names,
+        patterns=compiled,
+        line_finder=line_finder,
+        literals=list(dict.fromkeys(literal for pattern_literals in literals for literal in pattern_literals)),
+        literal_automaton=build_literal_automaton(literals)
+    )
+
+
+def compile_custom_patterns(pattern_list: List[str]) -> Dict[str, re.Pattern]:
+    """
+    Compile user-supplied patterns (e.g. --histogram-mode) case-insensitive.
+    
+    Invalid patterns are logged and skipped; the others keep the name of
+    their position in the list.
+    
+    Args:
+        pattern_list: Regex patterns
+        
+    Returns:
+        Dictionary of pattern names (custom_pattern_<index>) to compiled patterns
+    """
+    patterns = {}
+    for i, pattern in enumerate(pattern_list):
+        try:
+            patterns[f"custom_pattern_{i}"] = re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            logger.warning(f"Invalid regex pattern '{pattern}': {e}")
+    return patterns
+
 
 class PatternMatcher:
     """Service for matching log patterns and extracting statistics."""
@@ -26,21 +248,21 @@ class PatternMatcher:
     def __init__(self):
         self.patterns_cache: Dict[str, re.Pattern] = {}
         self.solutions_cache: Dict[str, str] = {}
+        self.universe_patterns: Dict[str, re.Pattern] = {}
+        self.pg_patterns: Dict[str, re.Pattern] = {}
+        self.custom_patterns_cache: Dict[Tuple[str, ...], Dict[str, re.Pattern]] = {}
+        self.combined_patterns_cache: Dict[Tuple[Tuple[str, str], ...], Optional[CombinedPattern]] = {}
         self._load_patterns()
     
     def _load_patterns(self) -> None:
         """Load patterns from configuration."""
         try:
-            import yaml
-            from pathlib import Path
-            
             config_path = settings.log_conf_path
             if not config_path.exists():
                 logger.warning(f"Pattern configuration file not found: {config_path}")
                 return
             
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = settings.load_log_config()
             
             # Load universe patterns
             universe_config = config.get("universe", {}).get("log_messages", [])
@@ -49,6 +271,7 @@ class PatternMatcher:
                 pattern = msg_dict["pattern"]
                 solution = msg_dict.get("solution", "No solution available for this log message.")
                 self.patterns_cache[name] = re.compile(pattern, re.IGNORECASE)
+                self.universe_patterns[name] = self.patterns_cache[name]
                 self.solutions_cache[name] = solution
             
             # Load PostgreSQL patterns
@@ -58,6 +281,7 @@ class PatternMatcher:
                 pattern = msg_dict["pattern"]
                 solution = msg_dict.get("solution", "No solution available for this log message.")
                 self.patterns_cache[name] = re.compile(pattern, re.IGNORECASE)
+                self.pg_patterns[name] = self.patterns_cache[name]
                 self.solutions_cache[name] = solution
             
             logger.info(f"Loaded {len(self.patterns_cache)} patterns")
@@ -75,56 +299,92 @@ class PatternMatcher:
         Returns:
             Dictionary of pattern names to compiled patterns
         """
-        # Dynamically select patterns based on config sections
-        # Instead of hardcoded names, use all loaded patterns for the log type
+        # Patterns are compiled once in _load_patterns; hand out the cached
+        # per-section dictionaries instead of re-reading the YAML config
         if log_type == "postgres":
-            # Only include patterns loaded from the pg section
-            pg_config = self._pg_pattern_names_from_config()
-            return {name: self.patterns_cache[name] for name in pg_config if name in self.patterns_cache}
-        else:
-            # All other log types use universe patterns
-            universe_config = self._universe_pattern_names_from_config()
-            return {name: self.patterns_cache[name] for name in universe_config if name in self.patterns_cache}
-
-    def _pg_pattern_names_from_config(self) -> list:
-        # Helper to get all pattern names from pg config
-        try:
-            import yaml
-            config_path = settings.log_conf_path
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            return [msg["name"] for msg in config.get("pg", {}).get("log_messages", [])]
-        except Exception:
-            return []
-
-    def _universe_pattern_names_from_config(self) -> list:
-        # Helper to get all pattern names from universe config
-        try:
-            import yaml
-            config_path = settings.log_conf_path
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-            return [msg["name"] for msg in config.get("universe", {}).get("log_messages", [])]
-        except Exception:
-            return []
+            return self.pg_patterns
+        # All other log types use universe patterns
+        return self.universe_patterns
+    
+    def get_combined_pattern(self, patterns: Dict[str, re.Pattern]) -> Optional[CombinedPattern]:
+        """
+        Get the combined alternation regex for a set of patterns.
+        
+        Args:
+            patterns: Dictionary of pattern names to compiled patterns
+            
+        Returns:
+            Cached CombinedPattern, or None if the patterns cannot be combined
+        """
+        cache_key = tuple((name, pattern.pattern) for name, pattern in patterns.items())
+        if cache_key not in self.combined_patterns_cache:
+            self.combined_patterns_cache[cache_key] = build_combined_pattern(patterns)
+        return self.combined_patterns_cache[cache_key]
     
-    def match_line(self, line: str, patterns: Dict[str, re.Pattern]) -> Optional[Tuple[str, re.Match]]:
+    def match_line(
+        self,
+        line: str,
+        patterns: Dict[str, re.Pattern],
+        combined: Optional[CombinedPattern] = None
+    ) -> Optional[Tuple[str, re.Match]]:
         """
         Match a log line against patterns.
         
+        The first pattern (in configuration order) that matches wins. When a
+        combined regex is given, lines matching no pattern are rejected with a
+        single scan; on a hit, only the patterns ordered before the matched
+        alternative need to be re-checked to keep first-pattern-wins semantics.
+        
         Args:
             line: Log line to match
             patterns: Dictionary of pattern names to compiled patterns
+            combined: Optional combined regex built from the same patterns
             
         Returns:
             Tuple of (pattern_name, match_object) or None if no match
         """
-        for pattern_name, pattern in patterns.items():
-            match = pattern.search(line)
+        if combined is None:
+            for pattern_name, pattern in patterns.items():
+                match = pattern.search(line)
+                if match:
+                    return pattern_name, match
+            return None
+        
+        combined_match = combined.regex.search(line)
+        if not combined_match:
+            return None
+        
+        index = int(combined_match.lastgroup[1:])
+        for earlier in range(index):
+            match = combined.patterns[earlier].search(line)
             if match:
-                return pattern_name, match
+                return combined.names[earlier], match
         
-        return None
+        return combined.names[index], combined.patterns[index].search(line)
+    
+    def match_pattern_name(
+        self,
+        line: str,
+        patterns: Dict[str, re.Pattern],
+        combined: Optional[CombinedPattern] = None
+    ) -> Optional[str]:
+        """
+        Return the name of the first pattern matching a log line.
+        
+        Same semantics as match_line, but skips re-running the winning
+        pattern just to produce a match object nobody reads.
+        
+        Args:
+            line: Log line to match
+            patterns: Dictionary of pattern names to compiled patterns
+            combined: Optional combined regex built from the same patterns
+            
+        Returns:
+            Pattern name or None if no match
+        """
+        if combined is None:
+            return first_matching_name(line, list(patterns.keys()), list(patterns.values()), None)
+        return first_matching_name(line, combined.names, combined.patterns, combined.regex)
     
     def analyze_log_file(
         self,
@@ -147,62 +407,49 @@ class PatternMatcher:
         Returns:
             Dictionary of pattern names to LogMessageStats
         """
-        solution=solution
         from services.file_processor import FileProcessor
 
         file_processor = FileProcessor()
-        message_stats: Dict[str, LogMessageStats] = {}
+        combined = self.get_combined_pattern(patterns)
+        if combined is not None:
+            names, compiled, combined_regex = combined.names, combined.patterns, combined.regex
+            literals, literal_automaton = combined.literals, combined.literal_automaton
+        else:
+            names, compiled, combined_regex = list(patterns.keys()), list(patterns.values()), None
+            literals, literal_automaton = None, None
 
         # Ensure file_path is a Path object
         file_path = Path(file_path)
-        try:
-            for line_num, line in enumerate(file_processor.read_log_file(file_path)):
-                # Parse timestamp from line
-                timestamp = self._parse_timestamp(line)
-                if not timestamp:
-                    continue
-
-                # Check if line is within time range
-                if not (start_time <= timestamp <= end_time):
-                    continue
-
-                # Match patterns
-                match_result = self.match_line(line, patterns)
-                if match_result:
-                    pattern_name, match = match_result
-
-                    # Get solution for this pattern
-                    solution = self.solutions_cache.get(pattern_name, "No solution available for this log message.")
-
-                    # Update statistics
-                    if pattern_name not in message_stats:
-                        message_stats[pattern_name] = LogMessageStats(
-                            pattern_name=pattern_name,
-                            start_time=timestamp,
-                            end_time=timestamp,
-                            count=1,
-                            solution=solution
-                        )
-                    else:
-                        stats = message_stats[pattern_name]
-                        stats.count += 1
-                        stats.start_time = min(stats.start_time, timestamp)
-                        stats.end_time = max(stats.end_time, timestamp)
-                        stats.solution = solution
-
-                    # Update histogram
-                    minute_key = timestamp.replace(second=0, microsecond=0).strftime('%Y-%m-%dT%H:%M:00Z')
-                    message_stats[pattern_name].histogram[minute_key] = (
-                        message_stats[pattern_name].histogram.get(minute_key, 0) + 1
-                    )
-
-                # Progress callback
-                if progress_callback and line_num % 1000 == 0:
-                    progress_callback(line_num)
+        if combined is not None and combined.line_finder is not None and file_path.suffix != '.gz':
+            # Plain files: scan the mapped bytes for candidate lines only
+            lines = file_processor.read_matching_lines(file_path, combined.line_finder)
+        else:
+            lines = file_processor.read_log_file(file_path)
 
+        records: Dict[str, PatternRecord] = {}
+        try:
+            scan_lines(
+                lines, names, compiled, combined_regex, start_time, end_time, records,
+                progress_callback, literals, literal_automaton
+            )
         except Exception as e:
             logger.error(f"Error analyzing log file {file_path}: {e}")
 
+        # Build the result objects once per pattern rather than once per match
+        message_stats: Dict[str, LogMessageStats] = {}
+        for pattern_name, record in records.items():
+            message_stats[pattern_name] = LogMessageStats(
+                pattern_name=pattern_name,
+                start_time=record.first_seen,
+                end_time=record.last_seen,
+                count=record.count,
+                histogram={
+                    f"{year:04d}-{month:02d}-{day:02d}T{hour:02d}:{minute:02d}:00Z": bucket_count
+                    for (year, month, day, hour, minute), bucket_count in record.histogram.items()
+                },
+                solution=self.solutions_cache.get(pattern_name, "No solution available for this log message.")
+            )
+
         return message_stats
     
     def _parse_timestamp(self, line: str) -> Optional[datetime]:
@@ -215,44 +462,31 @@ class PatternMatcher:
         Returns:
             Parsed datetime or None if parsing fails
         """
-        try:
-            if line.startswith(('I', 'W', 'E', 'F')):
-                # Format: I1231 10:30:45.123456
-                parts = line.split()
-                if len(parts) >= 2:
-                    time_str = parts[0][1:] + " " + parts[1][:5]
-                    return datetime.strptime(time_str, "%m%d %H:%M").replace(
-                        year=datetime.now().year
-                    )
-            else:
-                # Format: 2023-12-31 10:30:45.123456
-                parts = line.split()
-                if len(parts) >= 2:
-                    time_str = parts[0] + " " + parts[1]
-                    return datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S.%f")
-        except (ValueError, IndexError):
-            pass
-        
-        return None
+        return parse_log_timestamp(line)
     
-    def get_custom_patterns(self, pattern_string: str) -> Dict[str, re.Pattern]:
+    def get_custom_patterns(self, pattern_string: Union[str, List[str]]) -> Dict[str, re.Pattern]:
         """
-        Create custom patterns from a comma-separated string.
+        Create custom patterns from a comma-separated string or list of patterns.
+        
+        Compiled patterns are cached per pattern list, so repeated calls (one
+        per analysis task) compile each regex only once.
         
         Args:
-            pattern_string: Comma-separated list of regex patterns
+            pattern_string: Comma-separated string or list of regex patterns
             
         Returns:
             Dictionary of pattern names to compiled patterns
         """
-        patterns = {}
-        pattern_list = [p.strip() for p in pattern_string.split(',') if p.strip()]
+        if isinstance(pattern_string, str):
+            pattern_list = [p.strip() for p in pattern_string.split(',') if p.strip()]
+        else:
+            pattern_list = [p.strip() for p in pattern_string if p and p.strip()]
         
-        for i, pattern in enumerate(pattern_list):
-            try:
-                pattern_name = f"custom_pattern_{i}"
-                patterns[pattern_name] = re.compile(pattern, re.IGNORECASE)
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern '{pattern}': {e}")
+        cache_key = tuple(pattern_list)
+        cached = self.custom_patterns_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        return patterns
\ No newline at end of file
+        patterns = compile_custom_patterns(pattern_list)
+        self.custom_patterns_cache[cache_key] = patterns
+        return patterns
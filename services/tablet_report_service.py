@@ -6,16 +6,50 @@ This service parses tablet report files and inserts parsed data into PostgreSQL
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 import uuid
 import json
+import re
 from utils.exceptions import AnalysisError, DatabaseError
+from utils.json_utils import load_json_file
 from config.settings import settings
 from services.database_service import DatabaseService
 
 logger = logging.getLogger(__name__)
 
+WHITESPACE_RE = re.compile(r'\s*')
+
+def find_report_files(bundle_dir: Path) -> Tuple[Optional[Path], Optional[Path], List[Path]]:
+    """
+    Locate the universe details, dump entities and tablet report files.
+
+    All three are collected in a single walk of the bundle directory instead
+    of one recursive glob per file type.
+
+    Args:
+        bundle_dir: Extracted support bundle directory
+
+    Returns:
+        Tuple of (universe_file, entity_file, tablet_report_files); the first
+        two are None if not found
+    """
+    universe_file = None
+    entity_file = None
+    tablet_report_files = []
+    for root, _dirs, files in os.walk(bundle_dir):
+        for name in files:
+            if name.endswith('universe-details.json'):
+                if universe_file is None:
+                    universe_file = Path(root, name)
+            elif name.endswith('dump-entities.json'):
+                if entity_file is None:
+                    entity_file = Path(root, name)
+            elif name.endswith('tablet_report.json'):
+                tablet_report_files.append(Path(root, name))
+    return universe_file, entity_file, tablet_report_files
+
+
 class TabletReportService:
     """
     Service for parsing and storing tablet report data.
@@ -28,16 +62,12 @@ class TabletReportService:
         Parse tablet report files from the support bundle directory.
         Returns a dict with parsed data for each table.
         """
-        try:
-            universe_file = next(bundle_dir.rglob('*universe-details.json'))
-            entity_file = next(bundle_dir.rglob('*dump-entities.json'))
-            tablet_report_files = list(bundle_dir.rglob('*tablet_report.json'))
-        except StopIteration:
+        universe_file, entity_file, tablet_report_files = find_report_files(bundle_dir)
+        if universe_file is None or entity_file is None:
             raise AnalysisError("Missing required universe-details.json or dump-entities.json in bundle.")
 
         # Parse universe details
-        with open(universe_file, 'r', encoding='utf-8') as f:
-            universe_data = json.load(f)
+        universe_data = load_json_file(universe_file)
         nodes = {}
         for node_detail in universe_data.get('nodeDetailsSet', []):
             private_ip = node_detail.get('cloudInfo', {}).get('private_ip')
@@ -54,8 +84,7 @@ class TabletReportService:
             }
 
         # Parse dump entities to correct tserver UUIDs
-        with open(entity_file, 'r', encoding='utf-8') as f:
-            entity_data = json.load(f)
+        entity_data = load_json_file(entity_file)
         for t in entity_data.get('tablets', []):
             for r in t.get('replicas', []):
                 ip, port = r.get('addr', ':').split(':')
@@ -93,10 +122,9 @@ class TabletReportService:
                 pos = 0
                 while pos < len(content):
                     try:
-                        obj, size = decoder.raw_decode(content, pos)
-                        pos += size
-                        while pos < len(content) and content[pos].isspace():
-                            pos += 1
+                        obj, pos = decoder.raw_decode(content, pos)
+                        # Skip the whitespace between documents in one C-level match
+                        pos = WHITESPACE_RE.match(content, pos).end()
                         for t_data in obj.get('content', []):
                             status = t_data.get('tablet', {}).get('tablet_status', {})
                             cstate = t_data.get('consensus_state', {}).get('cstate', {})
@@ -20,9 +20,13 @@ import time
 import gzip
 from collections import defaultdict
 import math
+import os
+import re
 
 __version__ = "2.2"
 
+WHITESPACE_RE = re.compile(r'\s*')
+
 def get_simplified_schema(max_replicas_per_zone=1):
     """
     Returns the SQL schema string with dynamic columns for region_zone_tablets.
@@ -99,6 +103,23 @@ def decode_partition_key(b64_string, default_hex):
     except (TypeError, base64.binascii.Error):
         return f"0x{default_hex}"
 
+def find_bundle_files(bundle_path):
+    """Finds universe details, dump entities and tablet report files in one directory walk."""
+    universe_files, entity_files, tablet_report_files = [], [], []
+    pending = [str(bundle_path)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif 'universe-details.json' in entry.name:
+                    universe_files.append(Path(entry.path))
+                elif 'dump-entities.json' in entry.name:
+                    entity_files.append(Path(entry.path))
+                elif 'tablet_report.json' in entry.name:
+                    tablet_report_files.append(Path(entry.path))
+    return universe_files, entity_files, tablet_report_files
+
 def open_file(file_path):
     """Opens a file, transparently handling .gz compression."""
     return gzip.open(file_path, 'rt', encoding='utf-8') if file_path.suffix == '.gz' else open(file_path, 'r', encoding='utf-8')
@@ -180,10 +201,8 @@ def parse_tablet_reports(cursor, file_paths, universe_nodes):
             pos = 0
             while pos < len(content):
                 try:
-                    obj, size = decoder.raw_decode(content, pos)
-                    pos += size
-                    while pos < len(content) and content[pos].isspace():
-                        pos += 1
+                    obj, pos = decoder.raw_decode(content, pos)
+                    pos = WHITESPACE_RE.match(content, pos).end()
 
                     tablets_to_insert = []
                     for t_data in obj.get('content', []):
@@ -350,9 +369,7 @@ def main():
 
     print(f"Starting parser. Output will be saved to '{output_file}'")
 
-    universe_files = list(bundle_path.rglob('*universe-details.json*'))
-    entity_files = list(bundle_path.rglob('*dump-entities.json*'))
-    tablet_report_files = list(bundle_path.rglob('*tablet_report.json*'))
+    universe_files, entity_files, tablet_report_files = find_bundle_files(bundle_path)
 
     if not universe_files or not entity_files:
         sys.exit("Error: Could not find 'universe-details.json' or 'dump-entities.json'.")
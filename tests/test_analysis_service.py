@@ -9,8 +9,8 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from models.log_metadata import AnalysisConfig, AnalysisReport
-from services.analysis_service import AnalysisService
+from models.log_metadata import AnalysisConfig, AnalysisReport, LogMessageStats, SupportBundleInfo
+from services.analysis_service import AnalysisService, merge_message_stats
 from utils.exceptions import AnalysisError, ValidationError
 
 
@@ -123,7 +123,7 @@ class TestAnalysisService:
                     
                     # Verify calls
                     mock_processor.extract_support_bundle.assert_called_once_with(bundle_path)
-                    mock_build.assert_called_once_with(mock_extracted_dir, "test_bundle.tar.gz")
+                    mock_build.assert_called_once_with(mock_extracted_dir, "test_bundle.tar.gz", sample_analysis_config)
                     mock_analyze.assert_called_once_with(mock_support_bundle_info, sample_analysis_config)
                     mock_generate.assert_called_once_with(mock_support_bundle_info, mock_results, sample_analysis_config)
                     
@@ -186,6 +186,136 @@ class TestAnalysisService:
         assert "/path/file2.log" in filtered_files
         assert "/path/file3.log" not in filtered_files
     
+    def test_merge_message_stats(self):
+        """Test per-file statistics are merged by pattern."""
+        target = {
+            "p1": LogMessageStats(
+                pattern_name="p1",
+                start_time=datetime(2023, 12, 31, 10, 0),
+                end_time=datetime(2023, 12, 31, 10, 5),
+                count=2,
+                histogram={"2023-12-31T10:00:00Z": 1, "2023-12-31T10:05:00Z": 1}
+            )
+        }
+        source = {
+            "p1": LogMessageStats(
+                pattern_name="p1",
+                start_time=datetime(2023, 12, 31, 9, 0),
+                end_time=datetime(2023, 12, 31, 10, 0),
+                count=3,
+                histogram={"2023-12-31T09:00:00Z": 1, "2023-12-31T10:00:00Z": 2}
+            ),
+            "p2": LogMessageStats(
+                pattern_name="p2",
+                start_time=datetime(2023, 12, 31, 11, 0),
+                end_time=datetime(2023, 12, 31, 11, 0),
+                count=1
+            )
+        }
+        
+        merge_message_stats(target, source)
+        
+        assert target["p1"].count == 5
+        assert target["p1"].start_time == datetime(2023, 12, 31, 9, 0)
+        assert target["p1"].end_time == datetime(2023, 12, 31, 10, 5)
+        assert target["p1"].histogram == {
+            "2023-12-31T09:00:00Z": 1,
+            "2023-12-31T10:00:00Z": 3,
+            "2023-12-31T10:05:00Z": 1
+        }
+        assert target["p2"] is source["p2"]
+    
+    def test_build_support_bundle_info_reuses_metadata(self, analysis_service, sample_analysis_config, tmp_path):
+        """Test unchanged files reuse cached metadata and changed files are re-read."""
+        extracted_dir = tmp_path / "bundle"
+        node_dir = extracted_dir / "yb-dev-n1" / "tserver"
+        node_dir.mkdir(parents=True)
+        unchanged = node_dir / "yb-tserver.INFO.log"
+        changed = node_dir / "yb-tserver.WARNING.log"
+        unchanged.write_text("2023-12-31 10:00:00.000 first\n2023-12-31 11:00:00.000 last\n")
+        changed.write_text("2023-12-31 10:00:00.000 first\n")
+        
+        first = analysis_service._build_support_bundle_info(extracted_dir, "bundle.tar.gz", sample_analysis_config)
+        changed.write_text("2023-12-31 10:00:00.000 first\n2023-12-31 12:00:00.000 last\n")
+        read_files = []
+        get_file_metadata = analysis_service.file_processor.get_file_metadata
+        with patch.object(
+            analysis_service.file_processor, "get_file_metadata",
+            side_effect=lambda path, *args: read_files.append(path) or get_file_metadata(path, *args)
+        ):
+            second = analysis_service._build_support_bundle_info(extracted_dir, "bundle.tar.gz", sample_analysis_config)
+        
+        assert read_files == [changed]
+        # The cache is plain JSON kept outside the extracted bundle contents
+        assert (tmp_path / ".bundle.tar.gz.metadata.json").is_file()
+        metadata = second.log_files_metadata["yb-dev-n1"]["yb-tserver"]
+        assert metadata == first.log_files_metadata["yb-dev-n1"]["yb-tserver"] | {
+            "WARN": {str(changed): metadata["WARN"][str(changed)]}
+        }
+        assert metadata["WARN"][str(changed)].end_time == datetime(2023, 12, 31, 12, 0)
+
+    def test_metadata_cache_discarded_after_year_change(self, analysis_service, sample_analysis_config, tmp_path):
+        """Test metadata cached in another year is re-read, as glog times depend on it."""
+        extracted_dir = tmp_path / "bundle"
+        node_dir = extracted_dir / "yb-dev-n1" / "tserver"
+        node_dir.mkdir(parents=True)
+        log_file = node_dir / "yb-tserver.INFO.log"
+        log_file.write_text("I1231 10:00:00.000000  1234 file.cc:10] first\n")
+
+        with patch("services.analysis_service.CURRENT_YEAR", 2023):
+            analysis_service._build_support_bundle_info(extracted_dir, "bundle.tar.gz", sample_analysis_config)
+        read_files = []
+        get_file_metadata = analysis_service.file_processor.get_file_metadata
+        with patch("services.analysis_service.CURRENT_YEAR", 2024), patch.object(
+            analysis_service.file_processor, "get_file_metadata",
+            side_effect=lambda path, *args: read_files.append(path) or get_file_metadata(path, *args)
+        ):
+            analysis_service._build_support_bundle_info(extracted_dir, "bundle.tar.gz", sample_analysis_config)
+
+        assert read_files == [log_file]
+
+    def test_metadata_cache_follows_run_config(self, analysis_service, sample_analysis_config, tmp_path):
+        """Test the metadata scan options come from the run's config, not the global settings."""
+        extracted_dir = tmp_path / "bundle"
+        node_dir = extracted_dir / "yb-dev-n1" / "tserver"
+        node_dir.mkdir(parents=True)
+        log_file = node_dir / "yb-tserver.INFO.log"
+        log_file.write_text("2023-12-31 10:00:00.000 first\n")
+
+        analysis_service._build_support_bundle_info(extracted_dir, "bundle.tar.gz", sample_analysis_config)
+        sample_analysis_config.gz_end_time_from_mtime = True
+        read_calls = []
+        get_file_metadata = analysis_service.file_processor.get_file_metadata
+        with patch.object(
+            analysis_service.file_processor, "get_file_metadata",
+            side_effect=lambda path, *args: read_calls.append((path, *args)) or get_file_metadata(path, *args)
+        ):
+            analysis_service._build_support_bundle_info(extracted_dir, "bundle.tar.gz", sample_analysis_config)
+
+        # A cache written with the other setting is discarded
+        assert read_calls == [(log_file, True)]
+
+    def test_apply_filters(self, analysis_service, sample_analysis_config):
+        """Test only requested nodes and log types are kept."""
+        bundle_info = SupportBundleInfo(
+            name="bundle",
+            directory=Path("/tmp"),
+            log_files_metadata={
+                "n1": {"yb-tserver": {"INFO": {}}, "yb-master": {"INFO": {}}},
+                "n2": {"yb-tserver": {"INFO": {}}},
+                "n3": {"yb-master": {"INFO": {}}}
+            }
+        )
+        sample_analysis_config.node_filter = ["n3", "n1", "n9"]
+        sample_analysis_config.log_type_filter = ["yb-tserver"]
+        
+        analysis_service._apply_filters(bundle_info, sample_analysis_config)
+        
+        assert bundle_info.log_files_metadata == {
+            "n1": {"yb-tserver": {"INFO": {}}},
+            "n3": {}
+        }
+    
     def test_save_and_load_report(self, analysis_service, tmp_path):
         """Test saving and loading reports."""
         # Create a sample report
@@ -0,0 +1,76 @@
+"""
+Tests for the Database Service.
+
+This module contains unit tests for database connection handling.
+"""
+
+import psycopg2
+import pytest
+from unittest.mock import MagicMock, patch
+
+from services import database_service as database_service_module
+from services.database_service import DatabaseService
+
+
+class TestDatabaseService:
+    """Test cases for DatabaseService."""
+
+    @pytest.fixture
+    def connect(self, monkeypatch):
+        """Replace psycopg2.connect with a factory of open mock connections."""
+        monkeypatch.setattr(database_service_module, "_pools", {})
+        with patch("psycopg2.connect", side_effect=lambda **kwargs: MagicMock(closed=0)) as connect:
+            yield connect
+
+    def test_get_connection_reuses_pooled_connection(self, connect):
+        """Test connections are returned to the pool and shared across services."""
+        with DatabaseService().get_connection() as first:
+            pass
+        with DatabaseService().get_connection() as second:
+            pass
+
+        assert first is second
+        assert connect.call_count == 1
+        first.close.assert_not_called()
+
+    def test_get_connection_opens_dedicated_connection_when_exhausted(self, connect, monkeypatch):
+        """Test a connection beyond the pool size is closed after use."""
+        monkeypatch.setattr(database_service_module, "POOL_MAX_CONNECTIONS", 1)
+        service = DatabaseService()
+
+        with service.get_connection() as pooled:
+            with service.get_connection() as dedicated:
+                pass
+
+        assert pooled is not dedicated
+        dedicated.close.assert_called_once()
+        pooled.close.assert_not_called()
+
+    def test_get_connection_replaces_broken_pooled_connection(self, connect):
+        """Test a pooled connection dropped by the server is closed and replaced."""
+        service = DatabaseService()
+        with service.get_connection() as stale:
+            pass
+        stale.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError(
+            "server closed the connection unexpectedly"
+        )
+
+        with service.get_connection() as fresh:
+            pass
+
+        assert fresh is not stale
+        stale.close.assert_called_once()
+        assert connect.call_count == 2
+
+    def test_get_connection_replaces_closed_pooled_connection(self, connect):
+        """Test a pooled connection that is already closed is not handed out."""
+        service = DatabaseService()
+        with service.get_connection() as closed:
+            pass
+        closed.closed = 2
+
+        with service.get_connection() as fresh:
+            pass
+
+        assert fresh is not closed
+        assert connect.call_count == 2
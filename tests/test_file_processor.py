@@ -0,0 +1,104 @@
+"""
+Tests for the File Processor.
+
+This module contains unit tests for extracting support bundles and reading
+time ranges from log files.
+"""
+
+import gzip
+import io
+import os
+import tarfile
+from datetime import datetime
+
+import pytest
+
+from services import file_processor as file_processor_module
+from services.file_processor import FileProcessor
+from utils.time_utils import CURRENT_YEAR
+
+
+def _tar_gz(files):
+    """Build a .tar.gz archive in memory from a mapping of names to contents."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class TestFileProcessor:
+    """Test cases for FileProcessor."""
+
+    @pytest.fixture
+    def file_processor(self):
+        """Create a FileProcessor instance for testing."""
+        return FileProcessor()
+
+    def test_extract_gz_time_range_reads_tail_across_reads(self, file_processor, tmp_path, monkeypatch):
+        """Test the end time comes from the last lines of a multi-member gzip file."""
+        monkeypatch.setattr(file_processor_module, "GZ_TAIL_READ_BYTES", 64)
+        file_path = tmp_path / "yb-tserver.INFO.gz"
+        with open(file_path, "wb") as f:
+            f.write(gzip.compress(b"preamble\nI1231 09:15:00.000001 first\n" + b"I1231 10:00:00.1 x\n" * 20))
+            f.write(gzip.compress(b"I1231 11:45:30.000001 last\r\ncontinued\n"))
+
+        start_time, end_time = file_processor._extract_gz_time_range(file_path)
+
+        assert start_time == datetime(CURRENT_YEAR, 12, 31, 9, 15)
+        assert end_time == datetime(CURRENT_YEAR, 12, 31, 11, 45)
+
+    def test_extract_gz_time_range_keeps_long_tail_lines(self, file_processor, tmp_path):
+        """Test long lines after the last timestamp do not push it out of the tail."""
+        file_path = tmp_path / "yb-tserver.INFO.gz"
+        with gzip.open(file_path, "wb") as f:
+            f.write(b"I1231 09:15:00.000001 first\nI1231 11:45:30.000001 last\n")
+            f.write((b"x" * 30000 + b"\n") * 3)
+
+        start_time, end_time = file_processor._extract_gz_time_range(file_path)
+
+        assert start_time == datetime(CURRENT_YEAR, 12, 31, 9, 15)
+        assert end_time == datetime(CURRENT_YEAR, 12, 31, 11, 45)
+
+    def test_extract_gz_time_range_end_time_from_mtime(self, file_processor, tmp_path):
+        """Test the mtime is the end time of .gz logs only when requested."""
+        file_path = tmp_path / "yb-tserver.INFO.gz"
+        with gzip.open(file_path, "wb") as f:
+            f.write(b"I1231 09:15:00.000001 first\nI1231 11:45:30.000001 last\n")
+        mtime = datetime(CURRENT_YEAR, 12, 31, 12, 0).timestamp()
+        os.utime(file_path, (mtime, mtime))
+
+        assert file_processor._extract_gz_time_range(file_path, gz_end_time_from_mtime=True) == (
+            datetime(CURRENT_YEAR, 12, 31, 9, 15), datetime(CURRENT_YEAR, 12, 31, 12, 0)
+        )
+        assert file_processor._extract_gz_time_range(file_path)[1] == datetime(CURRENT_YEAR, 12, 31, 11, 45)
+
+    def test_extract_support_bundle_merges_nested_archives(self, file_processor, tmp_path):
+        """Test nested archives sharing a directory are all extracted into it."""
+        bundle_path = tmp_path / "bundle.tar.gz"
+        bundle_path.write_bytes(_tar_gz({
+            "bundle/node-1/a.tar.gz": _tar_gz({"logs/a.INFO": b"a", "inner.tgz": _tar_gz({"logs/c.INFO": b"c"})}),
+            "bundle/node-1/b.tar.gz": _tar_gz({"logs/b.INFO": b"b"}),
+        }))
+
+        extracted_dir = file_processor.extract_support_bundle(bundle_path)
+
+        logs = extracted_dir / "node-1" / "logs"
+        assert sorted(path.name for path in logs.iterdir()) == ["a.INFO", "b.INFO", "c.INFO"]
+        assert file_processor._extraction_marker(bundle_path).exists()
+        assert sorted(path.name for path in tmp_path.iterdir()) == [".bundle.tar.gz.extracted", "bundle", "bundle.tar.gz"]
+
+    def test_extract_support_bundle_corrupt_nested_archive(self, file_processor, tmp_path):
+        """Test a bundle with an unreadable nested archive is not marked as extracted."""
+        bundle_path = tmp_path / "bundle.tar.gz"
+        bundle_path.write_bytes(_tar_gz({
+            "bundle/node-1/a.tar.gz": _tar_gz({"logs/a.INFO": b"a"}),
+            "bundle/node-1/b.tar.gz": b"not an archive",
+        }))
+
+        extracted_dir = file_processor.extract_support_bundle(bundle_path)
+
+        assert (extracted_dir / "node-1" / "logs" / "a.INFO").read_bytes() == b"a"
+        assert not file_processor._extraction_marker(bundle_path).exists()
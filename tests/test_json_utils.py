@@ -0,0 +1,68 @@
+"""
+Tests for the JSON helpers.
+"""
+
+import pytest
+from datetime import datetime
+
+from utils import json_utils
+from utils.json_utils import dump_json_file, dumps, iter_json_chunks
+
+
+RESULT = {
+    "nodes": {
+        "node-1": {"tserver": {"logMessages": {"a\nb": {"count": 2, "histogram": {}}}}},
+        "node-2": {},
+    },
+    "universeName": "bundle",
+    "long_operations": [],
+    "started": datetime(2024, 1, 1, 10, 30),
+}
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+class TestIterJsonChunks:
+    """Test cases for streamed JSON serialization."""
+
+    @pytest.mark.parametrize("indent", [True, False])
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_chunks_match_single_dump(self, monkeypatch, indent, use_orjson):
+        """Test streamed output is byte-identical to a single dumps call."""
+        if not use_orjson:
+            monkeypatch.setattr(json_utils, "orjson", None)
+        elif json_utils.orjson is None:
+            pytest.skip("orjson is not installed")
+
+        expected = dumps(RESULT, indent=indent, default=_isoformat)
+        for stream_depth in (1, 2, 3):
+            chunks = iter_json_chunks(RESULT, indent, _isoformat, stream_depth)
+            assert b"".join(chunks) == expected
+
+    def test_dump_json_file_streamed(self, tmp_path):
+        """Test a streamed file parses back to the same document."""
+        path = tmp_path / "result.json"
+        dump_json_file(path, RESULT, indent=True, default=_isoformat, stream_depth=2)
+
+        assert json_utils.load_json_file(path)["nodes"] == RESULT["nodes"]
+
+
+class TestLoads:
+    """Test cases for JSON parsing."""
+
+    def test_loads_accepts_what_json_accepts(self):
+        """Test documents orjson rejects, as written by the json fallback, still load."""
+        data = b'{"ratio": NaN, "limit": Infinity, "offset": 18446744073709551616}'
+
+        value = json_utils.loads(data)
+
+        assert value["ratio"] != value["ratio"]
+        assert value["limit"] == float("inf")
+        assert value["offset"] == 2 ** 64
+
+    def test_loads_invalid_document(self):
+        """Test invalid documents still raise a ValueError."""
+        with pytest.raises(ValueError):
+            json_utils.loads(b'{"count": }')
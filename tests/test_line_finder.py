@@ -0,0 +1,104 @@
+"""
+Tests for the candidate line finders.
+"""
+
+import re
+
+import pytest
+
+import services.line_finder as line_finder
+from services.line_finder import HyperscanLineFinder, Re2LineFinder, RegexLineFinder, build_line_finder
+
+
+class FakeDatabase:
+    """Stand-in for a Hyperscan database that reports every match end."""
+
+    def __init__(self, pattern: bytes):
+        self.regex = re.compile(pattern, re.IGNORECASE)
+
+    def scan(self, data, match_event_handler, context):
+        for match in self.regex.finditer(data):
+            match_event_handler(0, match.start(), match.end(), 0, context)
+
+
+BUFFER = b"alpha\nbeta ERROR one\ngamma\nERROR two error\nlast error"
+
+
+def _lines(finder, buf):
+    return [buf[start:end] for start, end in finder.iter_line_spans(buf)]
+
+
+class TestLineFinders:
+    """Test cases for line finders."""
+
+    def test_regex_line_finder(self):
+        """Test each candidate line is yielded once."""
+        finder = build_line_finder(["error"])
+        assert isinstance(finder, (RegexLineFinder, HyperscanLineFinder))
+        assert _lines(finder, BUFFER) == [b"beta ERROR one", b"ERROR two error", b"last error"]
+
+    def test_hyperscan_line_finder_chunks(self, monkeypatch):
+        """Test chunked scanning keeps lines whole across chunk boundaries."""
+        monkeypatch.setattr(line_finder, "HYPERSCAN_CHUNK_BYTES", 8)
+        finder = HyperscanLineFinder(FakeDatabase(b"error"))
+        assert _lines(finder, BUFFER) == [b"beta ERROR one", b"ERROR two error", b"last error"]
+
+    def test_re2_line_finder(self, monkeypatch):
+        """Test RE2 is used without Hyperscan, unless it cannot compile the patterns."""
+        pytest.importorskip("re2")
+        monkeypatch.setattr(line_finder, "hyperscan", None)
+        finder = build_line_finder(["error", "^gamma"])
+        assert isinstance(finder, Re2LineFinder)
+        assert _lines(finder, BUFFER) == [b"beta ERROR one", b"gamma", b"ERROR two error", b"last error"]
+        assert type(build_line_finder([r"(e)rror \1"])) is RegexLineFinder
+
+    def test_non_ascii_patterns_not_supported(self):
+        """Test non-ASCII patterns fall back to line-by-line reading."""
+        assert build_line_finder(["café"]) is None
+
+    @pytest.mark.parametrize("backend", ["hyperscan", "re2", "re"])
+    def test_non_ascii_lines_are_candidates(self, monkeypatch, backend):
+        """Test lines the str patterns match through non-ASCII characters are yielded."""
+        if backend != "re" and getattr(line_finder, backend) is None:
+            pytest.skip(f"{backend} is not installed")
+        if backend != "hyperscan":
+            monkeypatch.setattr(line_finder, "hyperscan", None)
+        if backend == "re":
+            monkeypatch.setattr(line_finder, "re2", None)
+        patterns = [r"lock.held", r"error\w+ code"]
+        buf = "a lock held\nx lockéheld\nnothing\ny erroré code\n".encode("utf-8")
+
+        lines = _lines(build_line_finder(patterns), buf)
+
+        assert lines == [b"a lock held", "x lockéheld".encode("utf-8"), "y erroré code".encode("utf-8")]
+        for line in lines:
+            assert any(re.search(pattern, line.decode("utf-8"), re.IGNORECASE) for pattern in patterns)
+
+    @pytest.mark.parametrize("backend", ["hyperscan", "re2", "re"])
+    def test_crlf_lines(self, monkeypatch, backend):
+        """Test CRLF lines are found, and patterns anchored at a line end are left to line reading."""
+        if backend != "re" and getattr(line_finder, backend) is None:
+            pytest.skip(f"{backend} is not installed")
+        if backend != "hyperscan":
+            monkeypatch.setattr(line_finder, "hyperscan", None)
+        if backend == "re":
+            monkeypatch.setattr(line_finder, "re2", None)
+        buf = b"a foo done\r\nb nothing\r\nc done not\r\n"
+
+        assert _lines(build_line_finder(["done"]), buf) == [b"a foo done\r", b"c done not\r"]
+        assert build_line_finder(["error", "done$"]) is None
+        assert build_line_finder([r"done\Z"]) is None
+
+    @pytest.mark.parametrize("source, anchored", [
+        ("done$", True),
+        (r"(?:done|finished$)", True),
+        (r"done\Z", True),
+        (r"cost \$5", False),
+        (r"[$]done", False),
+        (r"[]$]done", False),
+        (r"[\]$]done", False),
+        (r"\\Z", False),
+    ])
+    def test_end_anchor_detection(self, source, anchored):
+        """Test only $ and \\Z anchors outside character classes are detected."""
+        assert line_finder._has_end_anchor(source) is anchored
@@ -0,0 +1,77 @@
+"""
+Tests for the Parquet Analysis Service.
+
+This module contains unit tests for analyzing Parquet log rows.
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+import duckdb
+
+from services.parquet_service import ParquetAnalysisService, _duckdb_cursor
+
+
+class TestParquetAnalysisService:
+    """Test cases for ParquetAnalysisService."""
+
+    @pytest.fixture
+    def parquet_service(self):
+        """Create a ParquetAnalysisService instance for testing."""
+        return ParquetAnalysisService()
+
+    def test_analyze_parquet_files_pushes_down_filters(self, parquet_service, tmp_path, monkeypatch):
+        """Test time, node and log type filters restrict the analyzed rows."""
+        monkeypatch.setattr(parquet_service, "get_long_operations_data", lambda *args: {})
+        duckdb.sql(f"""
+            COPY (
+                SELECT * FROM (VALUES
+                    ('n1', 'tserver', TIMESTAMP '2024-01-01 10:29:59', 'VoteRequest timed out', 'b'),
+                    ('n1', 'tserver', TIMESTAMP '2024-01-01 10:30:00', 'VoteRequest timed out', 'b'),
+                    ('n1', 'tserver', TIMESTAMP '2024-01-01 10:31:59', 'VoteRequest timed out', 'b'),
+                    ('n1', 'tserver', TIMESTAMP '2024-01-01 10:32:00', 'VoteRequest timed out', 'b'),
+                    ('n1', 'master', TIMESTAMP '2024-01-01 10:30:00', 'VoteRequest timed out', 'b'),
+                    ('n2', 'tserver', TIMESTAMP '2024-01-01 10:30:00', 'VoteRequest timed out', 'b')
+                ) AS t(node_name, log_type, timestamp, message, support_bundle)
+            ) TO '{tmp_path / "logs.parquet"}'
+        """)
+
+        result = parquet_service.analyze_parquet_files(
+            tmp_path, ["timed out"], num_threads=1,
+            start_time=datetime(2024, 1, 1, 10, 30),
+            end_time=datetime(2024, 1, 1, 10, 31),
+            node_filter=["n1"],
+            log_type_filter=["tserver"]
+        )
+
+        assert list(result["nodes"]) == ["n1"]
+        assert list(result["nodes"]["n1"]) == ["tserver"]
+        assert result["nodes"]["n1"]["tserver"]["logMessages"]["timed out"]["count"] == 2
+
+    def test_query_pattern_matches_keeps_shared_threads(self, parquet_service, tmp_path):
+        """Test the pattern query runs with its own thread count, leaving the shared connection's."""
+        parquet_path = tmp_path / "logs.parquet"
+        duckdb.sql(f"""
+            COPY (
+                SELECT 'n1' AS node_name, 'tserver' AS log_type,
+                       TIMESTAMP '2024-01-01 10:30:00' AS timestamp, 'timed out' AS message
+            ) TO '{parquet_path}'
+        """)
+        con = _duckdb_cursor()
+        try:
+            previous_threads = con.execute("SELECT current_setting('threads')").fetchone()[0]
+        finally:
+            con.close()
+
+        with patch("services.parquet_service.duckdb.connect", wraps=duckdb.connect) as connect:
+            rows = parquet_service._query_pattern_matches(str(parquet_path), ["timed out"], previous_threads + 1)
+
+        connect.assert_called_once_with(config={"threads": previous_threads + 1})
+
+        con = _duckdb_cursor()
+        try:
+            assert con.execute("SELECT current_setting('threads')").fetchone()[0] == previous_threads
+        finally:
+            con.close()
+        assert rows
@@ -0,0 +1,272 @@
+"""
+Tests for the Pattern Matcher service.
+
+This module contains unit tests for pattern loading, line matching and
+per-file log analysis.
+"""
+
+import re
+
+import pytest
+from datetime import datetime
+
+from services.match_kernel import first_matching_name
+from services.pattern_matcher import PatternMatcher, build_combined_pattern, required_literals
+
+
+class TestPatternMatcher:
+    """Test cases for PatternMatcher."""
+
+    @pytest.fixture
+    def pattern_matcher(self):
+        """Create a PatternMatcher instance for testing."""
+        return PatternMatcher()
+
+    def test_patterns_for_log_type(self, pattern_matcher):
+        """Test that patterns are selected by configuration section."""
+        pg_patterns = pattern_matcher.get_patterns_for_log_type("postgres")
+        universe_patterns = pattern_matcher.get_patterns_for_log_type("yb-tserver")
+
+        assert "latch already owned by" in pg_patterns
+        assert "Soft memory limit exceeded" in universe_patterns
+        assert "latch already owned by" not in universe_patterns
+
+        # Repeated calls reuse the compiled patterns
+        assert pattern_matcher.get_patterns_for_log_type("postgres") is pg_patterns
+
+    def test_custom_patterns_from_list(self, pattern_matcher):
+        """Test custom patterns built from a histogram-mode list."""
+        patterns = pattern_matcher.get_custom_patterns(["error1", " error2 ", "", "bad[regex"])
+
+        assert list(patterns.keys()) == ["custom_pattern_0", "custom_pattern_1"]
+        assert patterns["custom_pattern_0"].search("got ERROR1 here")
+        assert pattern_matcher.get_custom_patterns(["error1", " error2 ", "", "bad[regex"]) is patterns
+
+    def test_analyze_log_file(self, pattern_matcher, tmp_path):
+        """Test pattern statistics for a glog formatted file."""
+        log_file = tmp_path / "yb-tserver.INFO"
+        log_file.write_text(
+            "I1231 10:30:45.123456  1234 file.cc:10] Soft memory limit exceeded (at 90%)\n"
+            "I1231 10:31:02.000000  1234 file.cc:10] nothing interesting\n"
+            "W1231 10:31:59.000000  1234 file.cc:10] Soft memory limit exceeded (at 91%)\n"
+            "I1231 10:45:00.000000  1234 file.cc:10] Soft memory limit exceeded (at 92%)\n"
+        )
+        year = datetime.now().year
+
+        stats = pattern_matcher.analyze_log_file(
+            str(log_file),
+            pattern_matcher.get_patterns_for_log_type("yb-tserver"),
+            datetime(year, 12, 31, 10, 0),
+            datetime(year, 12, 31, 10, 40)
+        )
+
+        soft_memory = stats["Soft memory limit exceeded"]
+        assert soft_memory.count == 2
+        assert soft_memory.start_time == datetime(year, 12, 31, 10, 30)
+        assert soft_memory.end_time == datetime(year, 12, 31, 10, 31)
+        assert soft_memory.histogram == {
+            f"{year}-12-31T10:30:00Z": 1,
+            f"{year}-12-31T10:31:00Z": 1
+        }
+
+    def test_analyze_mixed_format_postgres_log(self, pattern_matcher, tmp_path):
+        """Test glog-style pggate lines in a postgres log are analyzed too."""
+        log_file = tmp_path / "postgresql-2023-12-31_103000.log"
+        log_file.write_text(
+            "2023-12-31 10:30:45.123 UTC [1234] LOG:  connection reset by peer\n"
+            "I1231 10:30:46.000000  1234 pg_client.cc:10] connection reset by peer\n"
+            "W1231 10:31:00.000000  1234 pg_latch.cc:10] latch already owned by\n"
+            "2023-12-31 10:32:00.000 UTC [1234] LOG:  done\n"
+        )
+
+        stats = pattern_matcher.analyze_log_file(
+            str(log_file),
+            pattern_matcher.get_patterns_for_log_type("postgres"),
+            datetime.min,
+            datetime.max
+        )
+
+        assert {name: record.count for name, record in stats.items()} == {
+            "connection reset by peer": 2,
+            "latch already owned by": 1
+        }
+
+    def test_match_line_combined_keeps_pattern_order(self, pattern_matcher):
+        """Test that the combined regex preserves first-pattern-wins semantics."""
+        patterns = pattern_matcher.get_custom_patterns(["timed out", "VoteRequest", "(a)\\1"])
+        combined = pattern_matcher.get_combined_pattern(patterns)
+        # Backreferences cannot be combined safely
+        assert combined is None
+
+        patterns = pattern_matcher.get_custom_patterns(["timed out", "VoteRequest"])
+        combined = pattern_matcher.get_combined_pattern(patterns)
+        line = "VoteRequest to peer timed out"
+
+        assert pattern_matcher.match_line(line, patterns, combined)[0] == "custom_pattern_0"
+        assert pattern_matcher.match_line(line, patterns)[0] == "custom_pattern_0"
+        assert pattern_matcher.match_line("no match here", patterns, combined) is None
+
+    def test_analyze_plain_and_gzip_files_agree(self, pattern_matcher, tmp_path):
+        """Test the memory-mapped candidate scan matches line-by-line reading."""
+        import gzip
+
+        content = (
+            "I1231 10:30:45.123456  1234 file.cc:10] first VoteRequest\n"
+            "I1231 10:30:46.000000  1234 file.cc:10] timed\n"
+            "I1231 10:30:47.000000  1234 file.cc:10] out\n"
+            "I1231 10:31:00.000000  1234 file.cc:10] peer TIMED OUT\r\n"
+            "I1231 10:32:00.000000  1234 file.cc:10] VoteRequest timed out"
+        )
+        plain_file = tmp_path / "yb-tserver.INFO"
+        plain_file.write_bytes(content.encode())
+        gz_file = tmp_path / "yb-tserver.INFO.gz"
+        with gzip.open(gz_file, "wb") as f:
+            f.write(content.encode())
+
+        patterns = pattern_matcher.get_custom_patterns(["timed\\s+out", "VoteRequest"])
+        year = datetime.now().year
+        window = (datetime(year, 12, 31, 10, 0), datetime(year, 12, 31, 11, 0))
+
+        plain_stats = pattern_matcher.analyze_log_file(str(plain_file), patterns, *window)
+        gz_stats = pattern_matcher.analyze_log_file(str(gz_file), patterns, *window)
+
+        assert {name: stats.count for name, stats in plain_stats.items()} == {
+            "custom_pattern_0": 2,
+            "custom_pattern_1": 1
+        }
+        assert {name: stats.histogram for name, stats in plain_stats.items()} == {
+            name: stats.histogram for name, stats in gz_stats.items()
+        }
+
+    def test_analyze_crlf_file_with_end_anchor(self, pattern_matcher, tmp_path):
+        """Test a pattern anchored at the line end matches CRLF lines of a plain file."""
+        log_file = tmp_path / "yb-tserver.INFO"
+        log_file.write_bytes(
+            b"I1231 10:30:45.123456  1234 file.cc:10] compaction done\r\n"
+            b"I1231 10:30:46.000000  1234 file.cc:10] done with flush\r\n"
+        )
+
+        stats = pattern_matcher.analyze_log_file(
+            str(log_file), pattern_matcher.get_custom_patterns(["done$"]), datetime.min, datetime.max
+        )
+
+        assert stats["custom_pattern_0"].count == 1
+
+    def test_match_pattern_name_agrees_with_match_line(self, pattern_matcher):
+        """Test the name-only matcher returns the same pattern as match_line."""
+        patterns = pattern_matcher.get_custom_patterns(["timed out", "VoteRequest"])
+        combined = pattern_matcher.get_combined_pattern(patterns)
+
+        for line in ("VoteRequest to peer timed out", "VoteRequest sent", "nothing"):
+            expected = pattern_matcher.match_line(line, patterns)
+            expected_name = expected[0] if expected else None
+            assert pattern_matcher.match_pattern_name(line, patterns, combined) == expected_name
+            assert pattern_matcher.match_pattern_name(line, patterns) == expected_name
+
+    def test_required_literals(self):
+        """Test only literals every match must contain are extracted."""
+        assert required_literals(re.compile("Operation failed.*memory consumption")) == ["memory consumption"]
+        assert required_literals(re.compile(r"Stopping writes because we have \d+ memtables")) == [
+            "stopping writes because we have "
+        ]
+        assert required_literals(re.compile("logs.*have been garbage collected*")) == ["have been garbage collecte"]
+        assert required_literals(re.compile("(foo)?barbaz")) == ["barbaz"]
+        assert required_literals(re.compile("timed out|VoteRequest")) == ["timed out", "voterequest"]
+        assert required_literals(re.compile("timed out|ab")) is None
+        assert required_literals(re.compile("ab{0,2}")) is None
+        assert required_literals(re.compile(r"\d{1000} entries")) == [" entries"]
+
+    @pytest.mark.parametrize("pattern, expected", [
+        (r"abc[.]def|ghi", ["abc", "ghi"]),
+        (r"[a]bc", None),
+        (r"[a]bcd", ["bcd"]),
+        (r"[]a]bcd", ["bcd"]),
+        (r"[^]a]bcd", ["bcd"]),
+        (r"[\]]bcd", ["bcd"]),
+    ])
+    def test_required_literals_character_classes(self, pattern, expected):
+        """Test a character class is skipped up to its own closing bracket."""
+        assert required_literals(re.compile(pattern)) == expected
+
+    @pytest.mark.parametrize("pattern, line", [
+        (r"\x41BCDEF", "ABCDEF"),
+        (r"foo\101bar", "fooAbar"),
+        (r"\N{LATIN SMALL LETTER A}bcd", "abcd"),
+        (r"\u0041bcdef", "Abcdef"),
+        (r"ab\0cdef", "ab\x00cdef"),
+    ])
+    def test_required_literals_multi_char_escapes(self, pattern, line):
+        """Test escapes spelled with several characters do not leak literals."""
+        compiled = re.compile(pattern)
+        assert compiled.search(line)
+        assert required_literals(compiled) is None
+
+    def test_literal_automaton_keeps_pattern_order(self):
+        """Test automaton dispatch returns the first matching pattern in order."""
+        pytest.importorskip("ahocorasick")
+        combined = build_combined_pattern({
+            "vote timeout": re.compile(r"VoteRequest.*timed out", re.IGNORECASE),
+            "vote reset": re.compile(r"VoteRequest.*connection reset", re.IGNORECASE),
+            "reset": re.compile(r"connection reset", re.IGNORECASE),
+        })
+        assert combined.literal_automaton is not None
+
+        def match(line):
+            return first_matching_name(
+                line, combined.names, combined.patterns, combined.regex,
+                combined.literals, combined.literal_automaton
+            )
+
+        assert match("VOTEREQUEST to peer: Connection reset by peer") == "vote reset"
+        assert match("read failed: connection reset by peer") == "reset"
+        assert match("VoteRequest sent") is None
+        assert match("nothing to see") is None
+
+    def test_alternation_patterns_are_prefiltered(self):
+        """Test patterns with top-level alternatives still get literals."""
+        combined = build_combined_pattern({
+            "disk": re.compile(r"disk (full|error)|out of space", re.IGNORECASE),
+            "vote": re.compile(r"VoteRequest.*timed out", re.IGNORECASE),
+        })
+        assert combined.literals == ["disk ", "out of space", "voterequest"]
+
+        for line, expected in (
+            ("write failed: Out of space", "disk"),
+            ("DISK FULL on /mnt/d0", "disk"),
+            ("VoteRequest timed out", "vote"),
+            ("disk is fine", None),
+        ):
+            assert first_matching_name(
+                line, combined.names, combined.patterns, combined.regex, combined.literals
+            ) == expected
+
+    @pytest.mark.parametrize("pattern, expected", [
+        (r"timed out[:] waiting|leader lost", ["timed out", "leader lost"]),
+        (r"disk[s]? full|no space [a-z]+ left", [" full", "no space "]),
+        (r"read \(fd\) failed|write\.error", [" failed", "write"]),
+        (r"(?:tablet|peer) unavailable|(stale|old) leader", [" unavailable", " leader"]),
+        (r"ab[|]cd|xyz", None),
+    ])
+    def test_required_literals_per_alternative(self, pattern, expected):
+        """Test alternatives mixed with classes, escapes and groups each get their literal."""
+        assert required_literals(re.compile(pattern)) == expected
+
+    def test_second_alternative_after_character_class_matches(self):
+        """Test a line matching only the alternative after a class is not prefiltered out."""
+        combined = build_combined_pattern({
+            "raft": re.compile(r"timed out[:] waiting|leader lost", re.IGNORECASE),
+        })
+        assert combined.literals == ["timed out", "leader lost"]
+
+        for line, expected in (
+            ("T 1 P 2: Leader lost", "raft"),
+            ("timed out: waiting for peer", "raft"),
+            ("leader elected", None),
+        ):
+            assert first_matching_name(
+                line, combined.names, combined.patterns, combined.regex, combined.literals
+            ) == expected
+            assert first_matching_name(
+                line, combined.names, combined.patterns, combined.regex,
+                combined.literals, combined.literal_automaton
+            ) == expected
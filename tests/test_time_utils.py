@@ -0,0 +1,102 @@
+"""
+Tests for the log timestamp parsing helpers.
+"""
+
+from datetime import datetime
+
+from utils.time_utils import (
+    CURRENT_YEAR, LogTimeParser, find_first_timestamp, glog_prefix_bounds, parse_log_timestamp
+)
+
+
+class TestParseLogTimestamp:
+    """Test cases for parse_log_timestamp."""
+
+    def test_glog_format(self):
+        """Test glog lines are parsed to minute precision in the current year."""
+        line = "I1231 10:30:45.123456  1234 file.cc:10] message"
+        assert parse_log_timestamp(line) == datetime(CURRENT_YEAR, 12, 31, 10, 30)
+
+    def test_postgres_format(self):
+        """Test postgres lines keep fractional seconds."""
+        line = "2023-12-31 10:30:45.123 UTC [1234] LOG:  message"
+        assert parse_log_timestamp(line) == datetime(2023, 12, 31, 10, 30, 45, 123000)
+        assert parse_log_timestamp("2023-12-31 10:30:45.1 UTC") == datetime(2023, 12, 31, 10, 30, 45, 100000)
+        assert parse_log_timestamp("2023-12-31 10:30:45.1234") == datetime(2023, 12, 31, 10, 30, 45, 123400)
+
+    def test_invalid_lines(self):
+        """Test lines without a valid timestamp."""
+        assert parse_log_timestamp("") is None
+        assert parse_log_timestamp("Info: not a glog line") is None
+        assert parse_log_timestamp("E1301 10:30:45.000000 bad month") is None
+        assert parse_log_timestamp("2023-12-31 10:30:45 UTC no fraction") is None
+
+
+class TestGlogPrefixBounds:
+    """Test cases for glog_prefix_bounds."""
+
+    def test_bounds_within_current_year(self):
+        """Test bounds are the "MMDD HH:MM" prefixes of the window."""
+        lower, upper = glog_prefix_bounds(
+            datetime(CURRENT_YEAR, 1, 2, 3, 4, 30),
+            datetime(CURRENT_YEAR, 12, 31, 23, 59)
+        )
+        assert (lower, upper) == ("0102 03:04", "1231 23:59")
+
+    def test_bounds_across_years(self):
+        """Test windows extending past the current year are unbounded on that side."""
+        lower, upper = glog_prefix_bounds(datetime(1900, 1, 1), datetime(CURRENT_YEAR + 1, 1, 1))
+        assert lower <= "0101 00:00" and upper >= "1231 23:59"
+
+        lower, upper = glog_prefix_bounds(datetime(1900, 1, 1), datetime(1900, 6, 1))
+        assert "0101 00:00" > upper
+
+
+class TestLogTimeParser:
+    """Test cases for LogTimeParser."""
+
+    def test_format_is_kept_after_first_timestamp(self):
+        """Test the parser keeps the format of the first parsed line."""
+        parser = LogTimeParser()
+        assert parser.parse("continuation line") is None
+        assert parser.format is None
+
+        assert parser.parse("I1231 10:30:45.123456  1234 file.cc:10] message") == datetime(CURRENT_YEAR, 12, 31, 10, 30)
+        assert parser.parse("W0101 00:01:00.000000  1234 file.cc:10] message") == datetime(CURRENT_YEAR, 1, 1, 0, 1)
+        assert parser.parse("") is None
+
+    def test_mixed_formats(self):
+        """Test postgres logs interleaving glog-style pggate lines keep both kinds."""
+        parser = LogTimeParser()
+        lines = [
+            "2023-12-31 10:30:45.123 UTC [1234] LOG:  connection reset by peer",
+            "I1231 10:30:46.000000  1234 pg_client.cc:10] connection reset by peer",
+            "W1231 10:31:00.000000  1234 pg_latch.cc:10] latch already owned by",
+            "2023-12-31 10:32:00.5 UTC [1234] LOG:  message",
+        ]
+        assert [parser.parse(line) for line in lines] == [parse_log_timestamp(line) for line in lines]
+        assert parser.parse("\tcontinuation line") is None
+
+
+class TestFindFirstTimestamp:
+    """Test cases for find_first_timestamp."""
+
+    def test_agrees_with_line_parser(self):
+        """Test the head regex returns what parsing line by line would."""
+        for line in (
+            "I1231 10:30:45.123456  1234 file.cc:10] message",
+            "2023-12-31 10:30:45.123 UTC [1234] LOG:  message",
+            "2023-12-31 10:30:45.5\r",
+            "2023-12-31 10:30:45.1234567 too many digits",
+        ):
+            assert find_first_timestamp(line) == parse_log_timestamp(line.rstrip("\r"))
+
+    def test_skips_lines_without_valid_timestamp(self):
+        """Test leading noise and invalid dates are skipped."""
+        text = (
+            "Log file created at: 2023/12/31 10:30:45\n"
+            "I1399 10:30:45.000000 invalid month\n"
+            "E0102 03:04:05.000000  1234 file.cc:10] first\n"
+        )
+        assert find_first_timestamp(text) == datetime(CURRENT_YEAR, 1, 2, 3, 4)
+        assert find_first_timestamp("no timestamps\n") is None
@@ -0,0 +1,147 @@
+"""
+JSON helpers for the Log Analyzer application.
+
+orjson is used when it is installed; otherwise these helpers fall back to
+the standard library json module. The two are not interchangeable at the
+edges: orjson rejects NaN/Infinity and integers wider than 64 bits, which
+json accepts, and writes non-finite floats as null. Parsing therefore falls
+back to json for documents orjson rejects, so files written without orjson
+still load once it is installed.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse a JSON document.
+    
+    Args:
+        data: JSON text as bytes or str
+        
+    Returns:
+        Parsed JSON value
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity and wide integers are valid for json only
+            pass
+    return json.loads(data)
+
+
+def load_json_file(path: Union[str, Path]) -> Any:
+    """
+    Read and parse a JSON file in a single read.
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON value
+    """
+    return loads(Path(path).read_bytes())
+
+
+def dumps(value: Any, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize a value to JSON.
+    
+    Args:
+        value: Value to serialize
+        indent: Pretty-print with two-space indentation
+        default: Called for objects that are not natively serializable
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        # numpy scalars and arrays (e.g. from DuckDB/pandas results) are
+        # serialized natively instead of going through default
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(value, default=default, option=option)
+    return json.dumps(value, indent=2 if indent else None, default=default).encode("utf-8")
+
+
+def iter_json_chunks(
+    value: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+    stream_depth: int = 1,
+    level: int = 0
+) -> Iterator[bytes]:
+    """
+    Serialize a value to JSON piece by piece.
+    
+    Dictionaries down to ``stream_depth`` levels are written entry by entry
+    and deeper values are serialized whole, so only one entry's JSON is held
+    in memory at a time. The concatenated chunks equal ``dumps(value)``.
+    
+    Args:
+        value: Value to serialize
+        indent: Pretty-print with two-space indentation
+        default: Called for objects that are not natively serializable
+        stream_depth: Number of dictionary levels to split into chunks
+        level: Nesting level of value, for indentation
+        
+    Yields:
+        UTF-8 encoded JSON chunks
+    """
+    if stream_depth <= 0 or not isinstance(value, dict) or not value:
+        chunk = dumps(value, indent=indent, default=default)
+        if indent and level:
+            # Raw newlines only come from indentation; strings escape theirs
+            chunk = chunk.replace(b"\n", b"\n" + b"  " * level)
+        yield chunk
+        return
+    
+    if indent:
+        item_separator, key_separator = b",", b": "
+        entry_prefix, closing = b"\n" + b"  " * (level + 1), b"\n" + b"  " * level + b"}"
+    else:
+        compact = orjson is not None
+        item_separator, key_separator = (b",", b":") if compact else (b", ", b": ")
+        entry_prefix, closing = b"", b"}"
+    
+    yield b"{"
+    for index, (key, item) in enumerate(value.items()):
+        yield (item_separator if index else b"") + entry_prefix + dumps(key) + key_separator
+        yield from iter_json_chunks(item, indent, default, stream_depth - 1, level + 1)
+    yield closing
+
+
+def dump_json_file(
+    path: Union[str, Path],
+    value: Any,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+    stream_depth: int = 0
+) -> None:
+    """
+    Serialize a value and write it to a JSON file.
+    
+    By default the document is serialized and written in a single write.
+    Large documents can be streamed instead (see iter_json_chunks), which
+    keeps the serialized form of only one entry in memory.
+    
+    Args:
+        path: Path to the JSON file
+        value: Value to serialize
+        indent: Pretty-print with two-space indentation
+        default: Called for objects that are not natively serializable
+        stream_depth: Number of dictionary levels to stream entry by entry;
+            0 serializes the whole value at once
+    """
+    if stream_depth <= 0:
+        Path(path).write_bytes(dumps(value, indent=indent, default=default))
+        return
+    with open(path, "wb") as f:
+        f.writelines(iter_json_chunks(value, indent, default, stream_depth))